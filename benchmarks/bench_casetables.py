@@ -0,0 +1,35 @@
+""" Benchmark : DOMString.toLowerCase / toUpperCase with and without a locale dict.
+
+Inputs of 1 KB, 1 MB and 10 MB are converted with the Turkish dotted/dotless i locale,
+the locale table being compiled once and reused from the cache.
+
+Usage : python bench_casetables.py
+"""
+
+from time import perf_counter
+from gdom.basicTypes import DOMString
+
+
+SIZES = {"1 KB": 2**10, "1 MB": 2**20, "10 MB": 10 * 2**20}
+LOWER_TR = {"I": "ı", "İ": "i"}
+UPPER_TR = {"i": "İ", "ı": "I"}
+PATTERN = "Istanbul İzmir <Ankara> & izmit ; ığüşöç "
+
+
+def timed(callback, *args):
+    start = perf_counter()
+    callback(*args)
+    return perf_counter() - start
+
+
+def main():
+    print("%-6s %14s %14s %14s %14s" % ("size", "lower", "lower(tr)", "upper", "upper(tr)"))
+    for label, size in SIZES.items():
+        text = DOMString((PATTERN * (size // len(PATTERN) + 1))[:size])
+        print("%-6s %13.4fs %13.4fs %13.4fs %13.4fs" % (label,
+            timed(text.toLowerCase), timed(text.toLowerCase, LOWER_TR),
+            timed(text.toUpperCase), timed(text.toUpperCase, UPPER_TR)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+""" Benchmark : DOMString versus LightDOMString on hot string operations.
+
+For each operation, reports the time per million calls and the number of DOMString objects
+built per million calls. Every DOMString built is an extra allocation on top of the plain str
+computed by the underlying str method.
+
+Usage : python bench_domstring.py [ops]
+"""
+
+import sys
+from time import perf_counter
+from gdom.basicTypes import DOMString, LightDOMString
+
+
+OPERATIONS = {
+    "slice":        lambda s: s[2:40],
+    "getitem":      lambda s: s[7],
+    "concat":       lambda s: s + "suffix",
+    "mod":          lambda s: s % (),
+    "lower":        lambda s: s.lower(),
+    "strip":        lambda s: s.strip(),
+    "charAt":       lambda s: s.charAt(3),
+    "substr":       lambda s: s.substr(5, 10),
+    "indexOf":      lambda s: s.indexOf("text", 4),
+}
+
+TEXT = "  Some text content of a text node, long enough to be sliced.  "
+
+
+class ConstructionCounter:
+    """ Counts DOMString constructions by temporarily replacing DOMString.__new__. """
+
+    def __init__(self): self.count = 0
+
+    def __enter__(self):
+        def counting(cls, *args, **kwdargs):
+            self.count += 1
+            return str.__new__(cls, *args, **kwdargs)
+        DOMString.__new__ = counting
+        return self
+
+    def __exit__(self, *exc): del DOMString.__new__
+
+
+def run(stringType, operation, ops):
+    string = stringType(TEXT)
+    with ConstructionCounter() as counter:
+        start = perf_counter()
+        for _ in range(ops): operation(string)
+        elapsed = perf_counter() - start
+    scale = 10**6 / ops
+    return elapsed * scale, counter.count * scale
+
+
+def main(ops=10**6):
+    print("%-10s %-16s %14s %22s" % ("operation", "type", "s / 10^6 ops", "DOMString / 10^6 ops"))
+    for name, operation in OPERATIONS.items():
+        for stringType in (DOMString, LightDOMString):
+            seconds, built = run(stringType, operation, ops)
+            print("%-10s %-16s %14.3f %22d" % (name, stringType.__name__, seconds, built))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10**6)
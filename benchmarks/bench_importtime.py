@@ -0,0 +1,48 @@
+""" Benchmark : cold-start import cost of gdom, based on 'python -X importtime'.
+
+Runs the import statement in fresh interpreters and reports the median time of the statement
+over a bare interpreter, plus the cumulative time of each gdom module.
+
+Usage : python bench_importtime.py [runs] [--json]
+"""
+
+import sys, json, subprocess
+from statistics import median
+
+
+STATEMENT = "from gdom import *"
+
+
+def importtime(statement=STATEMENT):
+    """ Return ({module: cumulative microseconds}, total microseconds) for one cold run of 'statement'. """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True)
+    times, total = {}, 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "[us]" in line: continue
+        selfTime, cumulative, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(cumulative)
+        if len(module) - len(module.lstrip()) == 1: total += int(cumulative) # Top level import : its cumulative time includes nested ones.
+    return times, total
+
+
+def main(runs=10, asJson=False, top=15):
+    baseline = median(importtime("pass")[1] for _ in range(runs))
+    samples = [importtime() for _ in range(runs)]
+    modules = {module: median(times.get(module, 0) for times, total in samples) for module in samples[0][0] if module.startswith("gdom")}
+    report = {
+        "statement": STATEMENT,
+        "runs": runs,
+        "interpreter_us": baseline,
+        "total_us": median(total for times, total in samples) - baseline,
+        "gdom_us": modules.get("gdom", 0),
+        "modules_us": dict(sorted(modules.items(), key=lambda item: -item[1])[:top]),
+    }
+    if asJson: print(json.dumps(report, indent=2))
+    else:
+        print("%s : %d us over the bare interpreter (gdom modules : %d us)" % (STATEMENT, report["total_us"], report["gdom_us"]))
+        for module, us in report["modules_us"].items(): print("%10d us  %s" % (us, module))
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--json"]
+    main(int(args[0]) if args else 10, "--json" in sys.argv)
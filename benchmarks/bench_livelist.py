@@ -0,0 +1,65 @@
+""" Benchmark : the testing/sample.js workload, gdom getElementsByTagName(NS) against a plain tree walk per call.
+
+Builds a bookstore document of 'books' <book> elements (sampleNS.xml layout), then runs the
+sample.js main loop : two getElementsByTagNameNS(..., "title")[0] per book and a price update
+through getElementsByTagNameNS("*", "price"), reading 'length' on every iteration.
+The document isn't declared with trackMutations (nothing reports its mutations), so gdom returns static lists :
+each call must cost one walk, never one walk per access.
+
+Usage : python bench_livelist.py [books]
+"""
+
+import io, sys
+from time import perf_counter
+from gdom import DOMImplementation
+from gdom.nodeIndex import walkElements
+from gdom.liveList import getElementsByTagName, getElementsByTagNameNS
+from gdom.streamParser import LSStreamParser
+
+
+EN = "http://www.oxforddictionaries.com/"
+FR = "http://www.oxforddictionaries.com/french/"
+BOOK = ('<book category="WEB" id="b%d"><en:title>Learning XML</en:title><fr:title>XML Facile</fr:title>'
+        '<author>Erik T. Ray</author><year>2003</year><en:price currency="dollar">39.95 $</en:price><fr:price currency="euro">32.50 E</fr:price></book>')
+
+
+def buildDocument(books):
+    document = DOMImplementation().createDocument()
+    source = '<bookstore xmlns:en="%s" xmlns:fr="%s">%s</bookstore>' % (EN, FR, "".join(BOOK % i for i in range(books)))
+    document.appendChild(next(LSStreamParser(document).parseSubtrees(io.BytesIO(source.encode()), "*", "bookstore")))
+    return document
+
+
+def naiveTagNameNS(root, namespaceURI, localName):
+    return [e for e in walkElements(root) if e is not root and namespaceURI in ("*", e.namespaceURI) and localName in ("*", e.localName)]
+
+def naiveTagName(root, tagName):
+    return [e for e in walkElements(root) if e is not root and tagName in ("*", e.nodeName)]
+
+
+def workload(document, byTagName, byTagNameNS):
+    books = byTagName(document, "book")
+    i = 0
+    while i < len(books):
+        book = books[i]
+        byTagNameNS(book, EN, "title")[0].firstChild.data += " (ENGLISH VERSION)"
+        byTagNameNS(book, EN, "title")[0].firstChild.data += " (FRENCH VERSION)"
+        prices = byTagNameNS(book, "*", "price")
+        p = 0
+        while p < len(prices):
+            data = prices[p].firstChild.data
+            prices[p].firstChild.data = str(float(data[:5]) + 5.87) + data[5:]
+            p += 1
+        i += 1
+
+
+def main(books=100000):
+    for label, byTagName, byTagNameNS in (("rewalk", naiveTagName, naiveTagNameNS), ("gdom", getElementsByTagName, getElementsByTagNameNS)):
+        document = buildDocument(books)
+        start = perf_counter()
+        workload(document, byTagName, byTagNameNS)
+        print("%-10s %d books : %.3fs" % (label, books, perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
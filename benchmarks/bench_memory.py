@@ -0,0 +1,50 @@
+""" Benchmark : memory per object (tracemalloc) for names, lists and, when gdom's DOMImplementation is available, element nodes.
+
+Usage : python bench_memory.py [count]
+"""
+
+import sys, tracemalloc
+from gdom.basicTypes import DOMString, DOMStringList, DOMStringPool
+
+
+NAMES = ["book", "title", "author", "year", "price", "location", "hours", "store"]
+
+
+def bytesPer(count, build):
+    """ Return traced bytes per item kept alive by build(count). """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build(count)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return used / count
+
+
+def freshNames(count): return [DOMString(NAMES[i % len(NAMES)]) for i in range(count)]
+
+def pooledNames(count):
+    pool = DOMStringPool()
+    return [pool[NAMES[i % len(NAMES)]] for i in range(count)]
+
+def stringLists(count): return [DOMStringList(trusted=True) for _ in range(count)]
+
+def elements(count):
+    from gdom import DOMImplementation
+    document = DOMImplementation().createDocument()
+    root = document.appendChild(document.createElement("bookstore"))
+    for i in range(count): root.appendChild(document.createElement(NAMES[i % len(NAMES)]))
+    return document
+
+
+def main(count=10**6):
+    print("%d objects" % count)
+    print("%-22s %8.1f bytes" % ("DOMString names", bytesPer(count, freshNames)))
+    print("%-22s %8.1f bytes" % ("pooled names", bytesPer(count, pooledNames)))
+    print("%-22s %8.1f bytes" % ("empty DOMStringList", bytesPer(count, stringLists)))
+    try: print("%-22s %8.1f bytes" % ("element node", bytesPer(count, elements)))
+    except (ImportError, AttributeError) as error: print("element node : skipped (%s)" % error)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10**6)
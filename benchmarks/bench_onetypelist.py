@@ -0,0 +1,50 @@
+""" Micro-benchmarks : OneTypeList construction, extend and concatenation.
+
+Usage : python bench_onetypelist.py [size]
+"""
+
+import sys
+from time import perf_counter
+from gdom.basicTypes import DOMString, DOMStringList
+
+
+def timed(callback):
+    start = perf_counter()
+    callback()
+    return perf_counter() - start
+
+
+def appendAll(items):
+    result = DOMStringList([])
+    for item in items: result.append(item)
+
+
+def cases(items):
+    half = DOMStringList(items[:len(items)//2], trusted=True)
+
+    def iadd():
+        result = DOMStringList(half, trusted=True)
+        result += half
+
+    return {
+        "construct":            lambda: DOMStringList(items),
+        "construct (trusted)":  lambda: DOMStringList(items, trusted=True),
+        "construct (append)":   lambda: appendAll(items),
+        "extend":               lambda: DOMStringList([]).extend(items),
+        "extend (trusted)":     lambda: DOMStringList([]).extend(items, trusted=True),
+        "extend (generator)":   lambda: DOMStringList([]).extend(item for item in items),
+        "concat (+)":           lambda: half + half,
+        "concat (+=)":          iadd,
+        "repeat (*)":           lambda: half * 2,
+    }
+
+
+def main(size=10**6):
+    items = [DOMString("item%d" % i) for i in range(size)]
+    print("%d elements" % size)
+    for name, callback in cases(items).items():
+        print("%-22s %8.4fs" % (name, timed(callback)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10**6)
@@ -0,0 +1,54 @@
+""" Benchmark : DocumentPipeline throughput against the number of worker processes.
+
+Writes 'documents' copies of testing/sample.xml (each with 'books' <book> elements) to a temporary directory,
+then runs the parse / transform (sample.js price update) / serialize pipeline with 1 to 'workers' processes.
+Reports documents per second and the speedup over a single worker ; ideally it grows with the number of cores.
+
+Usage : python bench_pipeline.py [documents] [workers] [books]
+"""
+
+import os, re, sys, tempfile
+from time import perf_counter
+from gdom.batch import DocumentPipeline
+
+
+TESTING = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "testing")
+
+
+def writeDocuments(directory, documents, books):
+    with open(os.path.join(TESTING, "sample.xml"), encoding="utf-8") as source: text = source.read()
+    start, end = text.index("\t<book "), text.index("\t<stores")
+    block = text[start:end]
+    body = "".join(re.sub(r'id="([^"]+)"', lambda match: 'id="%s-%d"' % (match.group(1), i), block) for i in range(max(books // 2, 1)))
+    uris = []
+    for i in range(documents):
+        uri = os.path.join(directory, "sample%d.xml" % i)
+        with open(uri, "w", encoding="utf-8") as output: output.write(text[:start] + body + text[end:])
+        uris.append(uri)
+    return uris
+
+
+def updatePrices(document):
+    """ The testing/sample.js price update (module level, so that it can be sent to worker processes). """
+    for price in document.getElementsByTagName("price"):
+        data = price.firstChild.data
+        price.firstChild.data = str(int(float(data[:5])) + 5.87) + data[5:]
+
+
+def main(documents=200, workers=None, books=100):
+    workers = workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        uris = writeDocuments(directory, documents, books)
+        single = None
+        for count in range(1, workers + 1):
+            pipeline = DocumentPipeline(updatePrices, workers=count, ordered=False)
+            start = perf_counter()
+            failed = sum(not result.ok for result in pipeline.run(uris))
+            seconds = perf_counter() - start
+            single = single or seconds
+            print("%2d worker(s) : %8.1f documents/s, speedup %.2f%s" % (count, documents / seconds, single / seconds, ", %d failed" % failed if failed else ""))
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
@@ -0,0 +1,82 @@
+""" Benchmark : LSStreamParser throughput and memory on a synthetic bookstore feed.
+
+The feed is generated on the fly (nothing is written on disk), so multi-GB inputs can be used.
+Reports MB/s and peak traced memory for event parsing and, when gdom's DOMImplementation
+is available, for <book> subtree extraction.
+
+Usage : python bench_streamparser.py [megabytes]
+"""
+
+import io, sys, tracemalloc
+from time import perf_counter
+from gdom.streamParser import LSStreamParser
+
+
+HEADER = b'''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE bookstore [
+	<!ENTITY dollar "&#36; (US DOLLAR)">
+	<!ENTITY euro "&#8364; (EURO)">
+]>
+<bookstore xmlns:en="http://www.oxforddictionaries.com/" xmlns:fr="http://www.oxforddictionaries.com/french/">
+'''
+BOOK = '''	<book category="WEB" id="b%d">
+		<en:title>Learning XML</en:title>
+		<fr:title>XML Facile</fr:title>
+		<author>Erik T. Ray</author>
+		<year>2003</year>
+		<en:price currency="dollar">39.95&dollar;</en:price>
+		<fr:price currency="euro">32.50&euro;</fr:price>
+	</book>
+'''
+FOOTER = b"</bookstore>\n"
+
+
+class SyntheticFeed(io.RawIOBase):
+    """ Read-only binary stream producing a bookstore document of about 'size' bytes. """
+
+    def __init__(self, size):
+        self.size, self.produced, self.books = size, 0, 0
+        self.pending, self.finished = HEADER, False
+    def readable(self): return True
+    def readinto(self, buffer):
+        while len(self.pending) < len(buffer) and not self.finished:
+            if self.produced >= self.size:
+                self.pending += FOOTER
+                self.finished = True
+                break
+            book = (BOOK % self.books).encode()
+            self.books += 1
+            self.produced += len(book)
+            self.pending += book
+        data, self.pending = self.pending[:len(buffer)], self.pending[len(buffer):]
+        buffer[:len(data)] = data
+        return len(data)
+
+
+TRACED_SIZE = 8 * 2**20 # tracemalloc slows parsing down a lot : memory is traced on a smaller feed only.
+
+
+def measure(label, size, consume):
+    start = perf_counter()
+    count = consume(io.BufferedReader(SyntheticFeed(size)))
+    elapsed = perf_counter() - start
+    tracemalloc.start()
+    consume(io.BufferedReader(SyntheticFeed(min(size, TRACED_SIZE))))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("%-10s %10d items %8.1f MB/s  peak %8.1f KB" % (label, count, size / elapsed / 2**20, peak / 2**10))
+
+
+def main(megabytes=100):
+    size = megabytes * 2**20
+    parser = LSStreamParser()
+    measure("events", size, lambda stream: sum(1 for _ in parser.parseEvents(stream)))
+    measure("lazy", size, lambda stream: sum(1 for _ in parser.parseSubtrees(stream, "*", "book", lazy=True)))
+    try: from gdom import DOMImplementation
+    except ImportError: return
+    parser.document = DOMImplementation().createDocument()
+    measure("subtrees", size, lambda stream: sum(1 for _ in parser.parseSubtrees(stream, "*", "book")))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
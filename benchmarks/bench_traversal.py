@@ -0,0 +1,63 @@
+""" Benchmark : full-document walks with the traversal engine versus naive recursion.
+
+Two documents are built : a wide one (bookstore with 'books' books) and a deep one (a chain of 'depth' elements).
+Naive recursion fails on the deep one as soon as depth exceeds the recursion limit.
+
+Usage : python bench_traversal.py [books] [depth]
+"""
+
+import sys
+from time import perf_counter
+from gdom import DOMImplementation
+from gdom.traversal import NodeFilter, walk, createNodeIterator, createTreeWalker
+
+
+def buildWide(books):
+    document = DOMImplementation().createDocument()
+    root = document.appendChild(document.createElement("bookstore"))
+    for i in range(books):
+        book = root.appendChild(document.createElement("book"))
+        for name in ("title", "author", "year", "price"):
+            book.appendChild(document.createElement(name)).appendChild(document.createTextNode(name))
+    return document
+
+def buildDeep(depth):
+    document = DOMImplementation().createDocument()
+    node = document
+    for i in range(depth): node = node.appendChild(document.createElement("level"))
+    return document
+
+
+def recursive(node):
+    count = 1
+    child = node.firstChild
+    while child is not None:
+        count += recursive(child)
+        child = child.nextSibling
+    return count
+
+
+CASES = {
+    "naive recursion":          recursive,
+    "walk":                     lambda document: sum(1 for _ in walk(document)),
+    "walk (elements)":          lambda document: sum(1 for _ in walk(document, NodeFilter.SHOW_ELEMENT)),
+    "TreeWalker":               lambda document: sum(1 for _ in createTreeWalker(document)),
+    "NodeIterator":             lambda document: sum(1 for _ in createNodeIterator(document)),
+    "NodeIterator (prefetch)":  lambda document: sum(1 for _ in createNodeIterator(document, prefetch=256)),
+}
+
+
+def main(books=100000, depth=20000):
+    for label, document in (("wide, %d books" % books, buildWide(books)), ("deep, depth %d" % depth, buildDeep(depth))):
+        print(label)
+        for name, case in CASES.items():
+            start = perf_counter()
+            try: count = case(document)
+            except RecursionError:
+                print("    %-24s RecursionError" % name)
+                continue
+            print("    %-24s %8.3fs  %d nodes" % (name, perf_counter() - start, count))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,184 @@
+""" Benchmark suite over the testing/ corpus.
+
+testing/sample.xml and testing/sampleNS.xml are scaled to synthetic documents (1 MB, 100 MB and 1 GB by default) by
+repeating their <book> elements with unique ids. Each case runs in a fresh interpreter so its peak RSS is its own.
+
+Cases :
+    parse-events        LSStreamParser events over the whole document
+    entity-expansion    same, on the variant keeping &dollar; / &euro; references (baseline : parse-events, entities pre-expanded)
+    parse-dom           full DOM parse through the LS feature
+    tagname-ns          getElementsByTagNameNS("*", "price") over the document
+    xpath-id            //book[@id='...'] lookups through XPathCompiler
+    mutation            the testing/sample.js price / title update
+    serialize           LSStreamSerializer to /dev/null
+    namespace-fixup     every <book> serialized on its own, so namespace declarations must be fixed up
+
+Results are written as JSON, two result files can be compared :
+    python suite.py [--sizes 1M,100M,1G] [--dom-limit 100M] [--output results.json] [--workdir DIR]
+    python suite.py --compare base.json new.json
+"""
+
+import os, re, sys, json, platform, resource, subprocess, tempfile
+from time import perf_counter
+
+
+TESTING = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "testing")
+UNITS = {"K": 2**10, "M": 2**20, "G": 2**30}
+EN = "http://www.oxforddictionaries.com/"
+
+# case -> (sample file, keep entity references, needs a DOM)
+CASES = {
+    "parse-events":     ("sampleNS.xml", False, False),
+    "entity-expansion": ("sampleNS.xml", True, False),
+    "parse-dom":        ("sampleNS.xml", True, True),
+    "tagname-ns":       ("sampleNS.xml", True, True),
+    "xpath-id":         ("sample.xml", True, True),
+    "mutation":         ("sampleNS.xml", True, True),
+    "serialize":        ("sample.xml", True, True),
+    "namespace-fixup":  ("sampleNS.xml", True, True),
+}
+ENTITIES = {"&dollar;": "&#36; (US DOLLAR)", "&euro;": "&#8364; (EURO)"}
+
+
+def parseSize(text): return int(float(text[:-1]) * UNITS[text[-1].upper()]) if text[-1].upper() in UNITS else int(text)
+
+
+# Synthetic documents =============================== #
+
+def scaledDocument(sample, size, entities, workdir):
+    """ Return the path of 'sample' scaled to about 'size' bytes (generated once per workdir). """
+
+    path = os.path.join(workdir, "%s.%d%s.xml" % (os.path.splitext(sample)[0], size, "" if entities else ".expanded"))
+    if os.path.exists(path): return path
+    with open(os.path.join(TESTING, sample), encoding="utf-8") as source: text = source.read()
+    start, end = text.index("\t<book "), text.index("\t<stores")
+    head, books, tail = text[:start], text[start:end], text[end:]
+    if not entities:
+        for reference, value in ENTITIES.items(): books = books.replace(reference, value)
+    with open(path + ".tmp", "w", encoding="utf-8") as output:
+        output.write(head)
+        written, copy = len(head) + len(tail), 0
+        while written < size:
+            block = re.sub(r'id="([^"]+)"', lambda match: 'id="%s-%d"' % (match.group(1), copy), books)
+            output.write(block)
+            written += len(block.encode("utf-8"))
+            copy += 1
+        output.write(tail)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+# Cases (run in the child process) ================== #
+
+def parseDocument(path):
+    from gdom import DOMImplementation
+    implementation = DOMImplementation()
+    implementation.getFeature("ls", "3.0")
+    return implementation.createLSParser(1, None).parseURI(path)
+
+def runCase(case, path):
+    """ Return (seconds, items) for 'case' on 'path', setup excluded. """
+
+    from gdom.streamParser import LSStreamParser
+    if not CASES[case][2]:
+        start = perf_counter()
+        items = sum(1 for _ in LSStreamParser().parseURI(path))
+        return perf_counter() - start, items
+
+    if case == "parse-dom":
+        start = perf_counter()
+        document = parseDocument(path)
+        return perf_counter() - start, 1
+    document = parseDocument(path) # Not declared with trackMutations : nothing reports its mutations.
+    start = perf_counter()
+
+    if case == "tagname-ns":
+        from gdom.liveList import getElementsByTagNameNS
+        prices = getElementsByTagNameNS(document, "*", "price")
+        items = sum(1 for _ in prices)
+    elif case == "xpath-id":
+        from gdom.nodeIndex import XPathCompiler
+        compiler = XPathCompiler()
+        items = sum(len(compiler.evaluate("//book[@id='web1-%d']" % i, document)) for i in range(1000))
+    elif case == "mutation":
+        from gdom.liveList import getElementsByTagName, getElementsByTagNameNS
+        books = getElementsByTagName(document, "book")
+        for book in books:
+            for suffix in (" (ENGLISH VERSION)", " (FRENCH VERSION)"): getElementsByTagNameNS(book, EN, "title")[0].firstChild.data += suffix
+            for price in getElementsByTagNameNS(book, "*", "price"):
+                data = price.firstChild.data
+                price.firstChild.data = str(int(float(data[:5])) + 5.87) + data[5:]
+        items = len(books)
+    elif case == "serialize":
+        from gdom.streamSerializer import LSStreamSerializer
+        with open(os.devnull, "wb") as output: LSStreamSerializer().writeToStream(document, output)
+        items = 1
+    elif case == "namespace-fixup":
+        from gdom.liveList import getElementsByTagName
+        from gdom.streamSerializer import LSStreamSerializer
+        serializer, items = LSStreamSerializer(), 0
+        with open(os.devnull, "wb") as output:
+            for book in getElementsByTagName(document, "book"):
+                serializer.writeToStream(book, output)
+                items += 1
+    return perf_counter() - start, items
+
+def child(case, path):
+    try:
+        seconds, items = runCase(case, path)
+        result = {"seconds": seconds, "items": items}
+    except Exception as error: result = {"error": "%s: %s" % (type(error).__name__, error)}
+    result["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps(result))
+
+
+# Driver ============================================ #
+
+def metadata():
+    try: commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, cwd=TESTING).stdout.strip() or None
+    except OSError: commit = None
+    return {"commit": commit, "python": platform.python_version(), "implementation": platform.python_implementation(), "machine": platform.machine()}
+
+def run(sizes, domLimit, workdir):
+    results = []
+    for size in sizes:
+        for case, (sample, entities, dom) in CASES.items():
+            entry = {"case": case, "size": size}
+            if dom and size > domLimit: entry["skipped"] = "DOM cases are limited to %d bytes" % domLimit
+            else:
+                path = scaledDocument(sample, size, entities, workdir)
+                entry["bytes"] = os.path.getsize(path)
+                process = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", case, path], capture_output=True, text=True)
+                try: entry.update(json.loads(process.stdout.strip().splitlines()[-1]))
+                except (IndexError, ValueError): entry["error"] = process.stderr.strip().splitlines()[-1:] or "no output"
+                if "seconds" in entry: entry["mb_per_s"] = entry["bytes"] / entry["seconds"] / 2**20 if entry["seconds"] else None
+            print("%-18s %12d  %s" % (case, size, ", ".join("%s=%s" % (k, v) for k, v in entry.items() if k not in ("case", "size"))), file=sys.stderr)
+            results.append(entry)
+    return {"metadata": metadata(), "results": results}
+
+def compare(basePath, newPath):
+    with open(basePath) as base, open(newPath) as new: base, new = json.load(base), json.load(new)
+    before = {(r["case"], r["size"]): r for r in base["results"]}
+    print("%-18s %12s %10s %10s %8s %12s" % ("case", "size", "base (s)", "new (s)", "ratio", "rss ratio"))
+    for result in new["results"]:
+        old = before.get((result["case"], result["size"]))
+        if not old or "seconds" not in old or "seconds" not in result: continue
+        print("%-18s %12d %10.3f %10.3f %8.2f %12.2f" % (result["case"], result["size"], old["seconds"], result["seconds"],
+              result["seconds"] / old["seconds"] if old["seconds"] else float("nan"), result["peak_rss_kb"] / old["peak_rss_kb"]))
+
+def main(args):
+    if args[:1] == ["--child"]: return child(args[1], args[2])
+    if args[:1] == ["--compare"]: return compare(args[1], args[2])
+    options = dict(zip(args[::2], args[1::2]))
+    sizes = [parseSize(size) for size in options.get("--sizes", "1M,100M,1G").split(",")]
+    workdir = options.get("--workdir") or os.path.join(tempfile.gettempdir(), "gdom-bench")
+    os.makedirs(workdir, exist_ok=True)
+    report = run(sizes, parseSize(options.get("--dom-limit", "100M")), workdir)
+    output = options.get("--output")
+    if output:
+        with open(output, "w") as stream: json.dump(report, stream, indent=2)
+    else: print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -3,8 +3,35 @@ gdom provide a large DOM Implementation that get easily extended by third party.
 Take a look at the GitHub project : https://github.com/YepoMax/gdom
 """
 
-from gdom.implementation import DOMImplementation, DOMImplementationSource
+__all__ = ["DOMImplementation", "DOMImplementationSource", "XMLNS_URI"]
 
+class _LazyName:
+    """ Stand-in for a name of 'module', imported on first use (call, attribute, isinstance, subclassing) only :
+        'from gdom import *' stays cheap for short-lived processes.
+        The first use rebinds the name in gdom to the real object. Names bound before (e.g. by 'from gdom import *') keep
+        the stand-in : their type is _LazyName, but they forward everything to the resolved object for one extra call. """
+    __slots__ = ("__module", "__name", "__value")
+
+    def __init__(self, module, name):
+        self.__module = module
+        self.__name = name
+        self.__value = None
+    def resolve(self):
+        if self.__value is None:
+            from importlib import import_module
+            self.__value = getattr(import_module(self.__module), self.__name)
+            globals()[self.__name] = self.__value
+        return self.__value
+
+    def __call__(self, *args, **kwdargs): return (self.__value or self.resolve())(*args, **kwdargs)
+    def __getattr__(self, name): return getattr(self.__value or self.resolve(), name)
+    def __instancecheck__(self, obj): return isinstance(obj, self.__value or self.resolve())
+    def __subclasscheck__(self, cls): return issubclass(cls, self.__value or self.resolve())
+    def __mro_entries__(self, bases): return (self.resolve(),)
+    def __repr__(self): return "<lazy %s.%s>" % (self.__module, self.__name)
+
+DOMImplementation = _LazyName("gdom.features", "DOMImplementation") # gdom.implementation's, with memoized features.
+DOMImplementationSource = _LazyName("gdom.implementation", "DOMImplementationSource")
 
 # @author       Maximilien Smout
 # @date         May 2014
@@ -37,6 +64,12 @@ DOCTEST :
 >>> LSS = DOMImp.createLSSerializer()
 >>> LSS.writeToString(doc)
 '<root xmlns:prefix="http://namespaceURI.be/"><item>text content</item><prefix:tag><![CDATA[<p> CDATASection </p>]]></prefix:tag></root>'
+>>> # Names imported before first use stay stand-ins, forwarding to the real class ; gdom itself now holds the class.
+>>> import gdom
+>>> type(DOMImplementation).__name__, gdom.DOMImplementation is DOMImplementation, isinstance(DOMImp, DOMImplementation)
+('_LazyName', False, True)
+>>> DOMImp.getFeature("LS", "3.0") is DOMImp.getFeature("ls", "3.0")
+True
 
 """
 
@@ -1,5 +1,6 @@
 from copy import deepcopy
-from re import match, sub as REsub
+from re import compile as REcompile
+from collections import OrderedDict
 from gdom.readonly import readonlyClass, readonlyMaster, ReadOnlyException
 
 
@@ -16,6 +17,64 @@ def insertAt(_list, index, item, fill=None):
         _list += [fill,]*(index - len(_list))
         _list.insert(index, item)
 
+class CaseTable(dict):
+    """ str.translate table compiled from a locale dict (single character -> replacement).
+        Characters missing from the locale are converted with 'convert' (str.lower, str.upper) on first encounter and cached. """
+    __slots__ = ("convert",)
+
+    def __init__(self, locale, convert):
+        dict.__init__(self, ((ord(char), value) for char, value in locale.items() if len(char) == 1))
+        self.convert = convert
+    def __missing__(self, code):
+        value = self[code] = self.convert(chr(code))
+        return value
+
+class PatternCache:
+    """ Bounded LRU cache of compiled regular expressions.
+        'hits' and 'misses' count lookups since creation (or last clear) so the cache can be sized. """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self.__patterns = OrderedDict()
+
+    def compile(self, pattern, flags=0):
+        """ Return the compiled version of 'pattern' (pattern string or RE object). """
+        key = (pattern, flags)
+        try:
+            regex = self.__patterns[key]
+            self.__patterns.move_to_end(key)
+            self.hits += 1
+        except KeyError:
+            regex = self.__patterns[key] = REcompile(pattern, flags)
+            if len(self.__patterns) > self.maxsize: self.__patterns.popitem(last=False)
+            self.misses += 1
+        return regex
+
+    def clear(self):
+        self.__patterns.clear()
+        self.hits = self.misses = 0
+
+    def info(self): return {"hits": self.hits, "misses": self.misses, "maxsize": self.maxsize, "size": len(self.__patterns)}
+
+    def __len__(self): return len(self.__patterns)
+
+patternCache = PatternCache()
+
+CASE_TABLES_SIZE = 64
+_caseTables = {}
+
+def caseTable(locale, convert):
+    """ Return the CaseTable of 'locale' for 'convert', compiling it only once per locale object.
+    Note : tables are cached by identity, a locale dict must not be modified once it has been used. """
+
+    key = (id(locale), convert)
+    entry = _caseTables.get(key)
+    if entry is None or entry[0] is not locale:
+        if len(_caseTables) >= CASE_TABLES_SIZE: _caseTables.clear()
+        entry = _caseTables[key] = (locale, CaseTable(locale, convert)) # Keeping a reference on locale prevents its id from being reused.
+    return entry[1]
+
 ### ==================================================================================== ###
 
 
@@ -39,6 +98,8 @@ class DOMString(str):
     # Some methods won't raise exception while the Java/Javascript equivalent would
     # BUT no exception will be raised while the Java/Javascript equivalent wouldn't.
 
+    __slots__ = ()
+
     # Built-in (redirect to DOMString type)
     def __add__(self, other): return DOMString(str.__add__(self, other))
     def __radd__(self, other): return DOMString(str.__add__(other, self))
@@ -53,13 +114,13 @@ class DOMString(str):
     def strip(self): return DOMString(str.strip(self))
     def rstrpi(self): return DOMString(str.rstrip(self))
     def format(self, *args, **kwdargs): return DOMString(str.format(self, *args, **kwdargs))
-    def split(self, sep=None, maxsplit=-1): return [DOMString(s) for s in self.split(sep, maxsplit)]
+    def split(self, sep=None, maxsplit=-1): return [DOMString(s) for s in str.split(self, sep, maxsplit)]
 
     # 'Javascript like' methods
     def charAt(self, i): return self[i]
     def charCodeAt(self, i): return ord(self[i])
     def contains(self, string): return string in self
-    def concat(self, other): return DOMString(self + other)
+    def concat(self, other): return self + other
     def indexOf(self, string, fromIndex=0): return self[fromIndex:].find(string)
     #def lastIndexOf(self, string): return len(self) - len(string) - DOMString(self[-1::-1]).indexOf(string[-1::-1])
     def lastIndexOf(self, string, fromIndex=None): return (self[:fromIndex+1] if fromIndex else self).rfind(string)
@@ -73,25 +134,17 @@ class DOMString(str):
     def substring(self, start, end): return self[start if start > 0 else 0:end if end > 0 else 0]
     def toLowerCase(self, locale={}): # See http://docs.oracle.com/javase/7/docs/api/java/lang/String.html#toLowerCase%28java.util.Locale%29 for explanation on locale argument.
         # No argument acts like Javascript's String.toLowerCase method.
-        string = DOMString()
-        for char in self:
-            if char in locale: string += locale[char]
-            else: string += char.lower()
-        return string
+        return DOMString(str.translate(self, caseTable(locale, str.lower)) if locale else str.lower(self))
     def toLocaleLowerCase(self): return self.lower() # No idea how to do it.
     def toUpperCase(self, locale={}): #See http://docs.oracle.com/javase/7/docs/api/java/lang/String.html#toUpperCase%28java.util.Locale%29 for explanation on locale argument
         # No argument acts like Javascript's String.toUpperCase method.
-        string = DOMString()
-        for char in self:
-            if char in locale: string += locale[char]
-            else: string += char.upper()
-        return string
+        return DOMString(str.translate(self, caseTable(locale, str.upper)) if locale else str.upper(self))
     def toLocaleUpperCase(self): return self.upper() # No idea how to achieve this ...
     def trim(self): return self.strip()
     def valueOf(obj, *args):
         """ Can be used as staticmethod. """
         if type(obj) is DOMString: value = obj
-        elif type(obj) is str: value = DOMString(obj)
+        elif isinstance(obj, str): value = DOMString(obj)
         elif type(obj) is bool: value = DOMString("True") if obj else DOMString("False")
         elif type(obj) is list:
             value, i = DOMString(), args[0] if len(args) else 0
@@ -131,7 +184,7 @@ class DOMString(str):
     #def codePointAt(self, i): return self.charCodeAt(self, i)
     #def codePointBefore(self, i):
     def compareTo(self, string): return self.localeCompare(string)
-    def compareToIgnoreCase(self, string): return self.lower().localeCompare(string.lower())
+    def compareToIgnoreCase(self, string): return DOMString.localeCompare(self.lower(), string.lower())
     def contentEquals(self, string): return self == string
     def startsWith(self, prefix, offset=0): return self[offset:offset+len(prefix)] == prefix
     def endsWith(self, suffix): return self.rfind(suffix) == len(self) - len(suffix) and self.rfind(suffix) > -1
@@ -143,15 +196,35 @@ class DOMString(str):
         for i in range(srcBegin, srcEnd): dst[dstBegin + (i-srcBegin)] = self[i]
     def hashCode(self): return hash(self)
     def isEmpty(self): return bool(self)
-    def matches(self, pattern): return bool(match(pattern, self))
+    def matches(self, pattern): return bool(patternCache.compile(pattern).match(self))
     def offsetByCodePoints(self, index, codePointOffset): return self.substr(index, codePointOffset)
     def regionMatches(self, *args): #ignoreCase, toffset, other, ooffset, length):
         if len(args) == 5: ignoreCase, toffset, other, ooffset, length = args
         elif len(args) == 4: ignoreCase, toffset, other, ooffset, length = (False,) + args
         else: raise TypeError("regionMatches() takes 4 or 5 arguments")
-        return self.substr(toffset, length).equalsIgnoreCase( other[ooffset:ooffset+length] ) if ignoreCase else self.substr(toffset,length) == other[ooffset:ooffset+length]
-    def replaceFirst(self, pattern, replacement): return REsub(pattern, replacement, self, 1)
-    def Split(self, pattern, limit=0): return [DOMString(s) for s in REsub(pattern, " "*len(self), self, limit).split(" "*len(self))]
+        return DOMString.equalsIgnoreCase(self.substr(toffset, length), other[ooffset:ooffset+length] ) if ignoreCase else self.substr(toffset,length) == other[ooffset:ooffset+length]
+    def replaceFirst(self, pattern, replacement): return patternCache.compile(pattern).sub(replacement, self, 1)
+    def Split(self, pattern, limit=0):
+        """ Java String.split : limit > 0 splits at most limit - 1 times, limit == 0 drops trailing empty strings, limit < 0 keeps them.
+
+        >>> s = DOMString("boo:and:foo")
+        >>> s.Split(":", 1), s.Split(":", 2), s.Split(":", 5), s.Split(":", -2)
+        (['boo:and:foo'], ['boo', 'and:foo'], ['boo', 'and', 'foo'], ['boo', 'and', 'foo'])
+        >>> s.Split("o", 5), s.Split("o", -2), s.Split("o", 0)
+        (['b', '', ':and:f', '', ''], ['b', '', ':and:f', '', ''], ['b', '', ':and:f'])
+        >>> DOMString("abc").Split(""), DOMString("abc").Split("", 2), DOMString("a1b2c").Split("(\\d)")
+        (['a', 'b', 'c'], ['a', 'bc'], ['a', 'b', 'c'])
+        """
+        if limit == 1: return [DOMString(self)] # maxsplit 0 would mean "no limit" to re.split.
+        regex = patternCache.compile(pattern)
+        first = regex.match(self)
+        leading = first is not None and first.end() == 0 # A zero-width match at the beginning never produces an empty leading string.
+        parts = regex.split(self, limit - 1 + leading if limit > 0 else 0)
+        if regex.groups: parts = parts[::regex.groups + 1] # Captured groups are not part of the result in Java.
+        if leading: del parts[0]
+        if limit == 0 and len(parts) > 1:
+            while parts and not parts[-1]: parts.pop()
+        return [DOMString(s) for s in parts]
     def subSequence(self, start, end): return self[start:end]
     def toCharArray(self): return [c for c in self] # Will be list of str, not a list of DOMString
     def clone(self): return self # No need to perform self[:] since in Python strings are value types.
@@ -166,12 +239,46 @@ class DOMString(str):
     def IsEmpty(self): return bool(self)
     def GetAt(self, i): return self[i] if i >= 0 else None
     def Compare(self, string): return self.localeCompare(string)
-    def CompareNoCase(self, string): return self.lower().localeCompare(string.lower())
+    def CompareNoCase(self, string): return DOMString.localeCompare(self.lower(), string.lower())
     def Mid(self, start, count=None): return self.substr(start,count) if count else self[start:]
     def Left(self, count): return self[:count]
     def Right(self, count): return self[-count:]
 
 
+class LightDOMString(str):
+    """
+        Lightweight DOMString : built-in str operations (slicing, concatenation, lower, strip, ...) are not overridden
+        and return plain str, so hot operations allocate a single object instead of a str plus a DOMString wrapper.
+        Javascript, Java and C like methods of DOMString are resolved lazily on first access and then cached on the class.
+    """
+
+    # Notes :
+    #
+    # - Results of DOMString methods called on a LightDOMString are plain str (or whatever the method returns for str),
+    #   so chained calls such as s.charAt(0).charCodeAt(0) need to wrap the intermediate result again.
+    # - DOMString(light) and LightDOMString(domstring) convert between both modes.
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        if name.startswith("__") or name not in DOMString.__dict__:
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+        attr = DOMString.__dict__[name]
+        setattr(LightDOMString, name, attr) # Next lookups are plain class attribute lookups.
+        return attr.__get__(self, type(self))
+
+
+class DOMStringPool(dict):
+    """ Per-document pool of interned DOMString : equal names (tag names, namespace URIs, prefixes) share a single object.
+        pool[name] and pool.intern(name) both return the pooled DOMString. """
+    __slots__ = ()
+
+    def __missing__(self, string):
+        value = self[string] = string if type(string) is DOMString else DOMString(string)
+        return value
+    def intern(self, string): return None if string is None else self[string]
+
+
 
 
 
@@ -188,21 +295,70 @@ class UserDataHandler:
     NODE_ADOPTED    = 5
 
 
-class DOMError:
-    """ Not implemented yet """
+### ======================== ###
 
-    def __init__(self, name, message=""):
+class DOMException(Exception):
+    """ See http://www.w3.org/TR/DOM-Level-3-Core/core.html#ID-17189187
+        Raised as DOMException("NOT_FOUND_ERR", message) : 'code' is the numeric code matching 'name'. """
+
+    INDEX_SIZE_ERR                  = 1
+    DOMSTRING_SIZE_ERR              = 2
+    HIERARCHY_REQUEST_ERR           = 3
+    WRONG_DOCUMENT_ERR              = 4
+    INVALID_CHARACTER_ERR           = 5
+    NO_DATA_ALLOWED_ERR             = 6
+    NO_MODIFICATION_ALLOWED_ERR     = 7
+    NOT_FOUND_ERR                   = 8
+    NOT_SUPPORTED_ERR               = 9
+    INUSE_ATTRIBUTE_ERR             = 10
+    INVALID_STATE_ERR               = 11
+    SYNTAX_ERR                      = 12
+    INVALID_MODIFICATION_ERR        = 13
+    NAMESPACE_ERR                   = 14
+    INVALID_ACCESS_ERR              = 15
+    VALIDATION_ERR                  = 16
+    TYPE_MISMATCH_ERR               = 17
 
+    def __init__(self, name, message=""):
+        Exception.__init__(self, "%s : %s" % (name, message) if message else name)
         self.name = name
         self.message = message
+        self.code = getattr(DOMException, name, 0)
+
+class DOMError:
+    """ Error reported to a DOMErrorHandler (see http://www.w3.org/TR/DOM-Level-3-Core/core.html#ERROR-Interfaces-DOMError).
+        'type' is a DOMString such as "wellformedness-error", "no-output-specified", ... """
+
+    SEVERITY_WARNING        = 1
+    SEVERITY_ERROR          = 2
+    SEVERITY_FATAL_ERROR    = 3
+
+    def __init__(self, type, message="", severity=SEVERITY_ERROR, relatedException=None, relatedData=None, location=None):
+
+        self.type = type
+        self.message = message
+        self.severity = severity
+        self.relatedException = relatedException
+        self.relatedData = relatedData
+        self.location = location or DOMLocator()
+
+    @property
+    def name(self): return self.type # Former attribute name.
+
+    def __repr__(self): return "%s(%r, %r, severity=%d)" % (type(self).__name__, self.type, self.message, self.severity)
 
 class DOMLocator:
-    """ Not implemented yet """
+    """ Location of a DOMError. Unknown values are -1 (numbers) or None. """
 
-    pass
+    def __init__(self, lineNumber=-1, columnNumber=-1, byteOffset=-1, utf16Offset=-1, relatedNode=None, uri=None):
 
+        self.lineNumber = lineNumber
+        self.columnNumber = columnNumber
+        self.byteOffset = byteOffset
+        self.utf16Offset = utf16Offset
+        self.relatedNode = relatedNode
+        self.uri = uri
 
-### ======================== ###
 
 ### DOMConfig =================================== ###
 
@@ -212,7 +368,7 @@ def config_addParameter(DOMConfig, parameters):
             'parameters' may include existing parameters, it will cause the parameters to have a new default value.
     """
 
-    params = DOMConfig.parameterNames + [DOMString(p.lower()) for p in parameters if p not in DOMConfig.parameterNames]
+    params = DOMStringList(DOMConfig.parameterNames, [DOMString(p.lower()) for p in parameters if p.lower() not in DOMConfig.parameterNames], readonly=True, indexed=True)
     readonlyMaster.setAttr(DOMConfig, "parameterNames", params)
 
     for param, value in parameters.items(): DOMConfig.setParameter(param, value)
@@ -220,7 +376,7 @@ def config_addParameter(DOMConfig, parameters):
 class DOMConfiguration(readonlyClass):
     """ Used at parsing, serializating, validation and normalization. """
 
-    __parameters = {
+    __defaults = {
         "canonical-form": False,
         "cdata-sections": True,
         "check-character-normalization": False,
@@ -248,7 +404,8 @@ class DOMConfiguration(readonlyClass):
 
     def __init__(self):
 
-        readonlyMaster.setAttr(self, "parameterNames", DOMStringList( [DOMString(p) for p in self.__parameters], readonly=True ))
+        readonlyMaster.setAttr(self, "parameterNames", DOMStringList( [DOMString(p) for p in self.__defaults], readonly=True, indexed=True ))
+        readonlyMaster.setAttr(self, "_DOMConfiguration__parameters", dict(self.__defaults)) # Each configuration owns its values.
 
     def setParameter(self, name, value):
         """ Set parameter to value. Note 'name' should be one from DOMConfiguration.parameterNames. """
@@ -286,60 +443,201 @@ class DOMConfiguration(readonlyClass):
     def __deepcopy__(self, *m):
 
         copied = DOMConfiguration()
-        for param in self.parameterNames: config_addParameter( copied, self.__parameters )
+        readonlyMaster.setAttr(copied, "parameterNames", self.parameterNames) # Readonly list, safe to share.
+        memo = m[0] if m else {}
+        copied.__parameters.update((name, deepcopy(value, memo)) for name, value in self.__parameters.items())
         return copied
 
+    def snapshot(self):
+        """ Return an immutable, hashable DOMConfigurationSnapshot of the current parameters. """
+        return DOMConfigurationSnapshot(self)
+
+def frozenParameter(value):
+    """ Immutable form of a parameter value : lists and tuples become tuples, sets frozensets.
+        Other values must be hashable (strings, booleans, handler objects, ...). """
+    if isinstance(value, (list, tuple)): return tuple(frozenParameter(item) for item in value)
+    if isinstance(value, (set, frozenset)): return frozenset(frozenParameter(item) for item in value)
+    try: hash(value)
+    except TypeError: raise DOMException("TYPE_MISMATCH_ERR", "Parameter value %r can't be frozen in a snapshot" % (value,)) from None
+    return value
+
+class DOMConfigurationSnapshot:
+    """ Immutable DOMConfiguration that can be shared between parsers and serializers (and threads) without copies.
+        New configurations are derived with withParams, which leaves the snapshot untouched.
+        Parameter values are frozen (see frozenParameter) : they don't change with the source configuration.
+
+        >>> config = DOMConfiguration()
+        >>> config.setParameter("schema-location", ["a.xsd"])
+        >>> snapshot = config.snapshot()
+        >>> config.getParameter("schema-location").append("b.xsd")
+        >>> snapshot.getParameter("schema-location"), hash(snapshot) == hash(config.snapshot().withParams(schema_location=["a.xsd"]))
+        (('a.xsd',), True)
+        >>> config.setParameter("schema-location", {"a": "a.xsd"})
+        >>> try: config.snapshot()
+        ... except DOMException as error: print(error.code, error)
+        17 TYPE_MISMATCH_ERR : Parameter value {'a': 'a.xsd'} can't be frozen in a snapshot
+        """
+    __slots__ = ("__config", "__items", "__hash")
+
+    def __init__(self, DOMConfig):
+        config = deepcopy(DOMConfig) # Private copy : nothing else holds a reference to it, so it never changes.
+        parameters = config._DOMConfiguration__parameters
+        for name, value in parameters.items(): parameters[name] = frozenParameter(value)
+        object.__setattr__(self, "_DOMConfigurationSnapshot__config", config)
+        object.__setattr__(self, "_DOMConfigurationSnapshot__items", tuple((name, config.getParameter(name)) for name in config.parameterNames))
+        object.__setattr__(self, "_DOMConfigurationSnapshot__hash", None)
+
+    def __setattr__(self, name, value): raise ReadOnlyException("%s is readonly" % type(self).__name__)
+    def __delattr__(self, name): raise ReadOnlyException("%s is readonly" % type(self).__name__)
+
+    @property
+    def parameterNames(self): return self.__config.parameterNames
+
+    def getParameter(self, name): return self.__config.getParameter(name)
+    def canSetParameter(self, name): return False
+    def setParameter(self, name, value): raise DOMException("NO_MODIFICATION_ALLOWED_ERR", "Configuration snapshots are immutable, use withParams instead")
+
+    def withParams(self, parameters={}, **kwdparams):
+        """ Return a new snapshot with 'parameters' (dict) and 'kwdparams' (underscores standing for hyphens) applied. """
+        config = self.configuration()
+        for name, value in parameters.items(): config.setParameter(name, value)
+        for name, value in kwdparams.items(): config.setParameter(name.replace("_", "-"), value)
+        return DOMConfigurationSnapshot(config)
+
+    def configuration(self):
+        """ Return a mutable DOMConfiguration holding the snapshot's parameters. """
+        return deepcopy(self.__config)
+
+    def __eq__(self, other): return isinstance(other, DOMConfigurationSnapshot) and self.__items == other.__items
+    def __hash__(self):
+        if self.__hash is None: object.__setattr__(self, "_DOMConfigurationSnapshot__hash", hash(self.__items))
+        return self.__hash
+    def __copy__(self): return self
+    def __deepcopy__(self, memo): return self
+
+    def __repr__(self): return "%s( %s )" % (type(self).__name__, ", ".join("%s=%r" % item for item in self.__items))
+
 ### ============================================= ###
 
 class OneTypeList(list):
     """ Base class for lists that admit only 1 type.
         Subclasses of specified type are also allowed. """
+    __slots__ = ("__readonly", "__readonlyError", "__valueType", "__indexed", "__index", "__weakref__")
 
-    def __init__(self, *iterable, valueType=None, readonly=False, readonlyError=None):
+    def __init__(self, *iterable, valueType=None, readonly=False, readonlyError=None, trusted=False, indexed=False):
+        """ Note :  'trusted' skips type checks, it is reserved to gdom internals that already know items match valueType.
+                    'indexed' makes contains, indexOf and 'in' use a value -> index map, built lazily and dropped on mutation. """
         self.__readonly = False
-        self.__readonlyError = readonlyError or ReadOnlyException("%s is readonly" % self.__class__.__name__)
+        self.__indexed = indexed
+        self.__index = None
+        self.__readonlyError = readonlyError # Default exception is only built when raised.
         if valueType: self.__valueType = valueType
         elif len(iterable): self.__valueType = type(iterable[0])
         else: raise Exception
         list.__init__(self)
-        for elem in iterable:
-            if type(elem) != valueType and hasattr(elem, "__iter__"):
-                for e in elem: self.append(e)
-            #if type(elem) is not valueType: raise TypeError
-            else: self.append(elem)
+        if len(iterable) == 1 and type(iterable[0]) != valueType and hasattr(iterable[0], "__iter__"): items = iterable[0]
+        else:
+            items = []
+            for elem in iterable:
+                if type(elem) != valueType and hasattr(elem, "__iter__"): items.extend(elem)
+                else: items.append(elem)
+        self.extend(items, trusted)
         self.__readonly = readonly
     def __getitem__(self, i): return list.__getitem__(self, i)
     def __setitem__(self, i, item): self.__checkReadonly(list.__setitem__, self, i, item)
-    def __add__(self, other): return type(self)(OneTypeList(list.__add__(self, other), valueType=self.__valueType))
-    def __mul__(self, other): return type(self)(OneTypeList(list.__mul__(self, other), valueType=self.__valueType))
-    def __rmul__(self, other): return type(self)(OneTypeList(list.__rmul__(self, other), valueType=self.__valueType))
-    def __iadd__(self, other): return type(self)(OneTypeList(list.__iadd__(self, other), valueType=self.__valueType))
-    def __imul__(self, other): return type(self)(OneTypeList(list.__imul__(self, other), valueType=self.__valueType))
+    def __delitem__(self, i): self.__checkReadonly(list.__delitem__, self, i)
+    def __contains__(self, item):
+        if self.__indexed:
+            index = self.__getIndex()
+            if index is not None: return item in index
+        return list.__contains__(self, item)
+    def __add__(self, other):
+        new = self.__derive(self)
+        list.extend(new, self.__checkedItems(other))
+        return new
+    def __mul__(self, other): return self.__derive(list.__mul__(self, other))
+    def __rmul__(self, other): return self.__derive(list.__rmul__(self, other))
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+    def __imul__(self, other):
+        self.__checkReadonly(list.__imul__, self, other)
+        return self
 
     def __checkReadonly(self, callback=None, *args):
-        if self.__readonly: raise self.readonlyError
-        if callback: callback(*args)
+        if self.__readonly: raise self.__readonlyError or ReadOnlyException("%s is readonly" % self.__class__.__name__)
+        self._invalidateIndex()
+        if callback: return callback(*args)
         return True
 
+    def _invalidateIndex(self):
+        """ Called before every mutation. Subclasses keeping their own lookup structures extend it. """
+        self.__index = None
+
+    def __getIndex(self):
+        """ Return the value -> last index map, or None if values are not hashable. """
+        if self.__index is None:
+            try: self.__index = {item: i for i, item in enumerate(self)}
+            except TypeError: self.__indexed = False # Unhashable values : fall back to linear scans.
+        return self.__index
+
+    def __typeError(self, itemType): return TypeError("Type <%s> doesn't match with required type <%s>." % (itemType.__name__, self.__valueType.__name__))
+
+    def __checkedItems(self, iterable):
+        """ Return 'iterable' as a sequence after checking, in one pass, that every item matches valueType. """
+        if isinstance(iterable, OneTypeList) and issubclass(iterable.__valueType, self.__valueType): return iterable
+        if not isinstance(iterable, (list, tuple)): iterable = list(iterable)
+        valueType = self.__valueType
+        for itemType in set(map(type, iterable)): # Each distinct type is checked once.
+            if itemType is not valueType and not issubclass(itemType, valueType): raise self.__typeError(itemType)
+        return iterable
+
+    def __derive(self, items):
+        """ New list of the same class, valueType and readonlyError holding 'items' (which must already match valueType). """
+        if type(self) is OneTypeList: new = OneTypeList(valueType=self.__valueType, readonlyError=self.__readonlyError)
+        else: new = type(self)(readonlyError=self.__readonlyError)
+        new.__indexed = self.__indexed
+        list.extend(new, items)
+        return new
+
     def insert(self, i, item):
-        if self.__readonly: raise self.__readonlyError
-        if type(item) is not self.__valueType and not issubclass(type(item), self.__valueType): raise TypeError("Type <%s> doesn't match with required type <%s>." % (item.__class__.__name__, self.__valueType.__class__.__name__))
-        list.insert(self, i, item)
-    def append(self, item): self.insert(len(self), item)
+        if not isinstance(item, self.__valueType): raise self.__typeError(type(item))
+        self.__checkReadonly(list.insert, self, i, item)
+    def append(self, item):
+        if not isinstance(item, self.__valueType): raise self.__typeError(type(item))
+        self.__checkReadonly(list.append, self, item)
     def clear(self): self.__checkReadonly(list.clear, self)
-    def extend(self, iterable):
-        for elem in iterable: self.append(elem)
+    def extend(self, iterable, trusted=False): self.__checkReadonly(list.extend, self, iterable if trusted else self.__checkedItems(iterable))
+    def pop(self, i=-1): return self.__checkReadonly(list.pop, self, i)
+    def remove(self, item): self.__checkReadonly(list.remove, self, item)
+    def reverse(self): self.__checkReadonly(list.reverse, self)
+    def sort(self, *, key=None, reverse=False):
+        self.__checkReadonly()
+        list.sort(self, key=key, reverse=reverse)
 
     def contains(self, string): return string in self
     def item(self, i): return itemInList(self, i)
     def indexOf(self, item):
+        if self.__indexed:
+            index = self.__getIndex()
+            if index is not None: return index.get(item, -1)
         i = len(self) - 1
         while i > -1 and self[i] != item: i-=1
         return i
 
-    def __copy__(self): return type(self)([e for e in self], readonly=self.__readonly,readonlyError=self.__readonlyError)
+    def __copy__(self): return self.__copyOf(self)
+    def __deepcopy__(self, memo): return self.__copyOf([deepcopy(e, memo) for e in self])
+    def __copyOf(self, items):
+        """ Copy keeping class, valueType, readonly, readonlyError and indexed.
 
-    def __deepcopy__(self, memo): return type(self)([deepcopy(e)  for e in self], readonly=self.__readonly,readonlyError=self.__readonlyError)
+        >>> from copy import copy, deepcopy
+        >>> names = DOMStringList([DOMString("a"), DOMString("b")], readonly=True, indexed=True)
+        >>> [(type(c).__name__, c._OneTypeList__indexed, c._OneTypeList__readonly, c.indexOf("b")) for c in (copy(names), deepcopy(names))]
+        [('DOMStringList', True, True, 1), ('DOMStringList', True, True, 1)]
+        """
+        new = self.__derive(items)
+        new.__readonly = self.__readonly
+        return new
 
     @property
     def length(self): return len(self)
@@ -350,7 +648,7 @@ class DOMStringList(OneTypeList):
     """ List of DOMString. """
     __slots__ = ()
 
-    def __init__(self, *iterable, readonly=False, readonlyError=None): OneTypeList.__init__(self, *iterable, valueType=DOMString, readonly=readonly, readonlyError=readonlyError)
+    def __init__(self, *iterable, readonly=False, readonlyError=None, trusted=False, indexed=False): OneTypeList.__init__(self, *iterable, valueType=DOMString, readonly=readonly, readonlyError=readonlyError, trusted=trusted, indexed=indexed)
 
 
 
@@ -359,11 +657,21 @@ class DOMStringList(OneTypeList):
 class NameList(OneTypeList):
     """ Provides an abstraction for an ordered collection of name and namespace value pairs. Items can be accessed by a 0-based index.
         This is used in 'validation' DOM feature (not implemented yet). """
-    __slots__ = ()
-
-    def __init__(self, *iterable, readonly=False, readonlyError=None): OneTypeList.__init__(self, *iterable, valueType=tuple, readonly=readonly, readonlyError=readonlyError)
-    def __contains__(self, key): return key in dict(self)
-    def contains(self, key): return key in self
+    __slots__ = ("__names",)
+
+    def __init__(self, *iterable, readonly=False, readonlyError=None, trusted=False):
+        self.__names = None
+        OneTypeList.__init__(self, *iterable, valueType=tuple, readonly=readonly, readonlyError=readonlyError, trusted=trusted, indexed=True)
+    def __contains__(self, key):
+        """ 'key' is either a name or a (namespaceURI, name) pair. """
+        if type(key) is tuple: return OneTypeList.__contains__(self, key)
+        if self.__names is None: self.__names = {item[1] for item in self}
+        return key in self.__names
+    def _invalidateIndex(self):
+        OneTypeList._invalidateIndex(self)
+        self.__names = None
+    def contains(self, name): return name in self
+    def containsNS(self, namespaceURI, name): return (namespaceURI, name) in self
     def getName(self, i):
         item = self.item(i)
         if item != None: item = item[1]
@@ -372,3 +680,9 @@ class NameList(OneTypeList):
         item = self.item(i)
         if item != None: item = item[0]
         return item
+
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,113 @@
+""" Batch processing of independent documents over a process pool.
+Each document is parsed, transformed by a user callback and serialized in a worker process.
+Failures don't stop the batch : they are reported as DOMError on the document's result.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from traceback import format_exception
+from xml.parsers.expat import ExpatError
+from os import cpu_count
+from gdom.basicTypes import DOMError, DOMLocator
+
+
+MODE_SYNCHRONOUS = 1
+
+
+class BatchResult:
+    """ Outcome of one document : 'output' is the serialized document (or the destination URI it was written to),
+        None if processing failed, in which case 'errors' holds the DOMError raised. """
+    __slots__ = ("uri", "output", "errors")
+
+    def __init__(self, uri, output=None, errors=()):
+        self.uri = uri
+        self.output = output
+        self.errors = list(errors)
+
+    @property
+    def ok(self): return not self.errors
+
+    def __repr__(self): return "%s(%r, %s)" % (type(self).__name__, self.uri, "ok" if self.ok else self.errors)
+
+
+def failure(uri, error, type=None, location=None):
+    """ BatchResult reporting 'error' for 'uri'. relatedException holds the formatted traceback rather than the exception
+        itself : results are pickled back from the workers and arbitrary exceptions may not survive it. """
+    return BatchResult(uri, errors=[DOMError(type or error.__class__.__name__, str(error), DOMError.SEVERITY_FATAL_ERROR,
+                                             "".join(format_exception(error.__class__, error, error.__traceback__)), uri, location or DOMLocator(uri=uri))])
+
+
+_implementation = None # One DOMImplementation per worker process.
+
+def processDocument(uri, transform=None, destination=None):
+    """ Parse 'uri', apply 'transform' and serialize the result. Run in worker processes, returns a BatchResult. """
+
+    global _implementation
+    try:
+        if _implementation is None:
+            from gdom import DOMImplementation
+            _implementation = DOMImplementation()
+            _implementation.getFeature("ls", "3.0")
+        document = _implementation.createLSParser(MODE_SYNCHRONOUS, None).parseURI(uri)
+        if transform is not None:
+            transformed = transform(document)
+            if transformed is not None: document = transformed
+        serializer = _implementation.createLSSerializer()
+        if destination is None: return BatchResult(uri, serializer.writeToString(document))
+        output = destination(uri)
+        serializer.writeToURI(document, output)
+        return BatchResult(uri, output)
+    except ExpatError as error:
+        return failure(uri, error, "wellformedness-error", DOMLocator(lineNumber=error.lineno, columnNumber=error.offset, uri=uri))
+    except Exception as error: return failure(uri, error)
+
+
+class DocumentPipeline:
+    """ Parse / transform / serialize many documents in parallel.
+
+        'transform' takes a Document and returns the Document to serialize (or None to keep the same one); like
+        'destination' (uri -> output URI, output is returned as string when None) it must be picklable (module level function).
+        At most 'maxPending' documents are in flight at once, so the URI iterable can be arbitrarily long.
+        Results are yielded in input order if 'ordered', as soon as they are ready otherwise.
+        If the pool breaks (a worker died), every document not processed yet gets a BrokenProcessPool DOMError. """
+
+    def __init__(self, transform=None, destination=None, workers=None, ordered=True, maxPending=None):
+
+        self.transform = transform
+        self.destination = destination
+        self.workers = workers or cpu_count() or 1
+        self.ordered = ordered
+        self.maxPending = maxPending or 2 * self.workers
+
+    def run(self, uris):
+        """ Yield a BatchResult per URI of 'uris'. """
+
+        uris = iter(uris)
+        with ProcessPoolExecutor(self.workers) as pool:
+            pending = deque() if self.ordered else {}   # (uri, future) in submission order, or future -> uri.
+            for uri in uris:
+                if len(pending) >= self.maxPending: yield from self.__collect(pending)
+                try: future = pool.submit(processDocument, uri, self.transform, self.destination)
+                except BrokenProcessPool as error:
+                    while pending: yield from self.__collect(pending) # Their futures fail with BrokenProcessPool too.
+                    yield failure(uri, error)
+                    for uri in uris: yield failure(uri, error)
+                    return
+                if self.ordered: pending.append((uri, future))
+                else: pending[future] = uri
+            while pending: yield from self.__collect(pending)
+
+    def __collect(self, pending):
+        """ Yield at least one finished result, blocking until there is one. """
+
+        if self.ordered:
+            yield self.__result(*pending.popleft())
+            while pending and pending[0][1].done(): yield self.__result(*pending.popleft())
+        else:
+            done, notDone = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done: yield self.__result(pending.pop(future), future)
+
+    def __result(self, uri, future):
+        try: return future.result()
+        except Exception as error: return failure(uri, error) # Worker crashed or the result couldn't be sent back.
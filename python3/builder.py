@@ -0,0 +1,140 @@
+""" Bulk DOM construction.
+FragmentBuilder turns nested tuples / dicts, or a flat stream of (depth, name, attributes, text) records
+(e.g. database rows), into a DocumentFragment in a single iterative pass.
+"""
+
+from gdom import XMLNS_URI
+from gdom.basicTypes import DOMStringPool
+
+
+XML_URI = "http://www.w3.org/XML/1998/namespace"
+
+END = object()
+
+
+class FragmentBuilder:
+    """ Build DocumentFragments of 'document'.
+
+        Nested form, for build :
+            "text"                                          -> Text node
+            (name,) (name, attributes) (name, attributes, children)
+            {"name": name, "attributes": {...}, "children": [...]}
+        where 'attributes' is a dict (or None) and 'children' a list of nested forms.
+        Records form, for buildRecords : (depth, name, attributes, text), depth 0 being the top level of the fragment.
+
+        Prefixed names ("en:title", "xmlns:en", ...) are created with the *NS methods, prefixes being looked up in
+        'namespaces' (prefix -> namespaceURI, "" for the default namespace) and in the xmlns declarations of the element
+        and its ancestors. Names go through a DOMStringPool so equal names share one object. """
+
+    def __init__(self, document, namespaces=None, pool=None):
+
+        self.document = document
+        self.namespaces = dict(namespaces or {})
+        self.pool = pool if pool is not None else DOMStringPool()
+        self.__createElement = document.createElement
+        self.__createElementNS = document.createElementNS
+        self.__createTextNode = document.createTextNode
+
+    def build(self, *nodes):
+        """ Return a DocumentFragment holding 'nodes' (nested form). """
+
+        fragment = self.document.createDocumentFragment()
+        stack = [(fragment, iter(nodes), self.namespaces)]   # (parent, children left to build, namespaces in scope)
+        while stack:
+            parent, children, scope = stack[-1]
+            spec = next(children, END)
+            if spec is END:
+                stack.pop()
+                continue
+            if isinstance(spec, str):
+                parent.appendChild(self.__createTextNode(spec))
+                continue
+            if isinstance(spec, dict): name, attributes, content = spec["name"], spec.get("attributes"), spec.get("children")
+            else: name, attributes, content = (tuple(spec) + (None, None))[:3]
+            element, childScope = self.__element(name, attributes, scope)
+            parent.appendChild(element)
+            if content: stack.append((element, iter(content), childScope))
+        return fragment
+
+    def buildRecords(self, records):
+        """ Return a DocumentFragment built from (depth, name, attributes, text) records in document order. """
+
+        fragment = self.document.createDocumentFragment()
+        parents = [(fragment, self.namespaces)]    # parents[d] is the parent of records at depth d, with its namespaces in scope.
+        for depth, name, attributes, text in records:
+            if depth >= len(parents): raise ValueError("Record '%s' at depth %d has no parent" % (name, depth))
+            del parents[depth+1:]
+            parent, scope = parents[depth]
+            element, scope = self.__element(name, attributes, scope)
+            parent.appendChild(element)
+            if text: element.appendChild(self.__createTextNode(text))
+            parents.append((element, scope))
+        return fragment
+
+    def element(self, name, attributes=None, namespaces=None):
+        """ Create an element with its attributes, prefixes being resolved in 'namespaces' (self.namespaces by default). """
+        return self.__element(name, attributes, self.namespaces if namespaces is None else namespaces)[0]
+
+    def __element(self, name, attributes, scope):
+        """ Return (element, namespaces in scope for its children). """
+
+        pool = self.pool
+        if attributes:
+            declarations = {attrName[6:]: value for attrName, value in attributes.items() if attrName == "xmlns" or attrName.startswith("xmlns:")}
+            if declarations: scope = dict(scope, **declarations) # Copy-on-write : elements without declarations share their parent's scope.
+        prefix, colon, localName = name.partition(":")
+        if colon: element = self.__createElementNS(self.__lookup(scope, prefix, name), pool[name])
+        elif scope.get(""): element = self.__createElementNS(scope[""], pool[name])
+        else: element = self.__createElement(pool[name])
+        if attributes:
+            for attrName, value in attributes.items():
+                prefix, colon, localName = attrName.partition(":")
+                if attrName == "xmlns" or prefix == "xmlns": element.setAttributeNS(XMLNS_URI, pool[attrName], value)
+                elif colon: element.setAttributeNS(self.__lookup(scope, prefix, attrName), pool[attrName], value)
+                else: element.setAttribute(pool[attrName], value)
+        return element, scope
+
+    def __lookup(self, scope, prefix, name):
+        if prefix == "xml": return XML_URI
+        try: return scope[prefix]
+        except KeyError: raise ValueError("Unknown prefix in '%s'" % name) from None
+
+
+
+"""
+
+DOCTEST :
+
+>>> from gdom import *
+>>> from gdom.builder import FragmentBuilder
+>>> doc = DOMImplementation().createDocument()
+>>> builder = FragmentBuilder(doc, {"fr": "http://www.oxforddictionaries.com/french/"})
+>>> fragment = builder.build(("bookstore", {"xmlns:en": "http://www.oxforddictionaries.com/"}, [
+...     ("book", {"id": "hp1"}, [("en:title", None, ["Harry Potter"]), ("fr:title", None, ["Harry Potter"]), {"name": "year", "children": ["2005"]}]),
+...     ("store", {"xmlns": "urn:stores"}, [("location",)]),
+... ]))
+>>> bookstore = fragment.firstChild
+>>> book, store = bookstore.firstChild, bookstore.lastChild
+>>> [(node.nodeName, node.namespaceURI) for node in (bookstore, book, book.firstChild, book.firstChild.nextSibling, store, store.firstChild)]
+[('bookstore', None), ('book', None), ('en:title', 'http://www.oxforddictionaries.com/'), ('fr:title', 'http://www.oxforddictionaries.com/french/'), ('store', 'urn:stores'), ('location', 'urn:stores')]
+>>> book.lastChild.firstChild.data
+'2005'
+>>> # Declarations don't leak out of the declaring element.
+>>> builder.build(("en:title",))
+Traceback (most recent call last):
+    ...
+ValueError: Unknown prefix in 'en:title'
+>>> records = [(0, "bookstore", {"xmlns:en": "http://www.oxforddictionaries.com/"}, None), (1, "book", None, None), (2, "en:title", None, "Learning XML"), (1, "book", None, None)]
+>>> bookstore = builder.buildRecords(records).firstChild
+>>> [node.nodeName for node in (bookstore.firstChild, bookstore.firstChild.firstChild, bookstore.lastChild)], bookstore.firstChild.firstChild.namespaceURI
+(['book', 'en:title', 'book'], 'http://www.oxforddictionaries.com/')
+
+"""
+
+
+
+if __name__ == "__main__":
+    import doctest
+    print(" Test starting ".center(40, "="), "\n")
+    doctest.testfile("builder.py")
+    print("", " Test finished ".center(40, "="), sep="\n")
@@ -0,0 +1,34 @@
+""" gdom DOMImplementation : the one of gdom.implementation, with memoized features.
+getFeature returns the same feature object for the same (feature, version) on an instance, so feature modules are
+only loaded by the first call. Features registered in FEATURES are served without gdom.implementation knowing them,
+their module is imported by the first getFeature call asking for them.
+"""
+
+from importlib import import_module
+from gdom import implementation
+
+
+FEATURES = { # feature name (lower case) -> (module name, attribute name) of the feature object
+    "profiling": ("gdom.profiling", "profiler"),
+}
+
+def registerFeature(feature, module, attribute):
+    """ Serve getattr(module, attribute) for getFeature(feature), 'module' being imported on first request only. """
+    FEATURES[feature.lower()] = (module, attribute)
+
+
+class DOMImplementation(implementation.DOMImplementation):
+
+    def getFeature(self, feature, version=None):
+        """ Unsupported features (None) are not cached. """
+
+        key = (feature.lower(), version)
+        try: return self._featureCache[key]
+        except AttributeError: self._featureCache = {} # Lives and dies with the instance.
+        except KeyError: pass
+        registered = FEATURES.get(key[0])
+        value = getattr(import_module(registered[0]), registered[1]) if registered else super().getFeature(feature, version)
+        if value is not None: self._featureCache[key] = value
+        return value
+
+    def hasFeature(self, feature, version=None): return feature.lower() in FEATURES or super().hasFeature(feature, version)
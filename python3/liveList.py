@@ -0,0 +1,123 @@
+""" Cached live NodeLists for getElementsByTagName / getElementsByTagNameNS.
+Each node has a subtree version, bumped on itself and its ancestors whenever its children change.
+A LiveElementList remembers the version of its root when it was filled and only walks the subtree
+again once that version has changed.
+Live lists are only returned for documents declared with nodeIndex.trackMutations, i.e. whose DOM implementation
+calls subtreeModified : other roots get a static list, filled by one walk of their subtree.
+"""
+
+from weakref import WeakKeyDictionary
+from gdom.basicTypes import OneTypeList
+from gdom.nodeIndex import walkElements, isTracked, nodeCache
+
+
+_versions = WeakKeyDictionary()  # node -> subtree version (missing means 0)
+
+def subtreeVersion(node): return _versions.get(node, 0)
+
+def matchingElements(root, namespaceURI, localName):
+    """ Elements under 'root' (excluded) matching namespaceURI / localName, in document order (see LiveElementList). """
+
+    elements = walkElements(root)
+    next(elements) # root itself
+    if namespaceURI is None: return [element for element in elements if localName == "*" or element.nodeName == localName]
+    return [element for element in elements if (namespaceURI == "*" or (element.namespaceURI or "") == namespaceURI)
+            and (localName == "*" or (element.localName or element.nodeName) == localName)]
+
+def subtreeModified(node):
+    """ Call after the children of 'node' changed (insertion, removal, replacement). Costs O(depth).
+        Not called by gdom itself : the DOM implementation calling it declares its documents with trackMutations. """
+
+    while node is not None:
+        _versions[node] = _versions.get(node, 0) + 1
+        node = node.parentNode
+
+
+class LiveElementList:
+    """ Live list of the elements under 'root' (excluded) matching namespaceURI / localName, in document order.
+        namespaceURI None selects by tag name (getElementsByTagName), "*" matches anything. """
+    __slots__ = ("root", "namespaceURI", "localName", "__elements", "__version")
+
+    def __init__(self, root, namespaceURI, localName):
+
+        self.root = root
+        self.namespaceURI = namespaceURI
+        self.localName = localName
+        self.__elements = []
+        self.__version = -1
+
+    def __refresh(self):
+        version = _versions.get(self.root, 0) if isTracked(self.root) else None
+        if version is None or version != self.__version:
+            self.__elements = matchingElements(self.root, self.namespaceURI, self.localName)
+            self.__version = version
+        return self.__elements
+
+    @property
+    def length(self): return len(self.__refresh())
+    def item(self, i):
+        elements = self.__refresh()
+        return elements[i] if 0 <= i < len(elements) else None
+
+    def __len__(self): return len(self.__refresh())
+    def __getitem__(self, i): return self.__refresh()[i]
+    def __iter__(self): return iter(list(self.__refresh()))
+    def __repr__(self): return "%s[ %s ]" % (type(self).__name__, ", ".join(repr(e) for e in self.__refresh()))
+
+
+def getElementsByTagNameNS(root, namespaceURI, localName):
+    """ Elements under 'root' with namespaceURI ("*" for any, "" or None for no namespace) and localName : cached live list
+        if the document of 'root' is tracked, static list otherwise. """
+    return liveList(root, namespaceURI or "", localName)
+
+def getElementsByTagName(root, tagName):
+    """ Elements under 'root' with tagName ("*" for any) : cached live list if the document of 'root' is tracked, static list otherwise. """
+    return liveList(root, None, tagName)
+
+def liveList(root, namespaceURI, localName):
+
+    if not isTracked(root): return OneTypeList(matchingElements(root, namespaceURI, localName), valueType=object, readonly=True, trusted=True)
+    lists = nodeCache(root, "_liveLists", dict) # {(namespaceURI, localName): LiveElementList}, kept on the root itself.
+    if lists is None: return LiveElementList(root, namespaceURI, localName)
+    key = (namespaceURI, localName)
+    elements = lists.get(key)
+    if elements is None: elements = lists[key] = LiveElementList(root, namespaceURI, localName)
+    return elements
+
+
+
+"""
+
+DOCTEST :
+    Note : variable named 'nocare' will avoid object representation which may generate useless doctest error.
+
+>>> from gdom import *
+>>> from gdom.nodeIndex import trackMutations
+>>> from gdom.liveList import getElementsByTagName, subtreeModified
+>>> doc = DOMImplementation().createDocument()
+>>> root = doc.appendChild(doc.createElement("bookstore"))
+>>> nocare = root.appendChild(doc.createElement("book"))
+>>> # Untracked document : one walk per call, the list doesn't follow later mutations.
+>>> books = getElementsByTagName(doc, "book")
+>>> nocare = root.appendChild(doc.createElement("book"))
+>>> type(books).__name__, books.length, getElementsByTagName(doc, "book").length
+('OneTypeList', 1, 2)
+>>> # Tracked document : cached live list, walked again once subtreeModified has been called.
+>>> trackMutations(doc)
+>>> books = getElementsByTagName(doc, "book")
+>>> books is getElementsByTagName(doc, "book"), books.length
+(True, 2)
+>>> nocare = root.appendChild(doc.createElement("book"))
+>>> subtreeModified(root)
+>>> books.length, books.item(2) is root.lastChild, books.item(3)
+(3, True, None)
+
+"""
+
+
+
+if __name__ == "__main__":
+    import doctest
+    print(" Test starting ".center(40, "="), "\n")
+    doctest.testfile("liveList.py")
+    print("", " Test finished ".center(40, "="), sep="\n")
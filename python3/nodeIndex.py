@@ -0,0 +1,309 @@
+""" Per-document element index and compiled XPath expressions.
+DocumentIndex maps (namespaceURI, localName), tag names and IDs to elements so that tag name lookups and
+simple XPath location paths don't rescan the whole tree. XPathCompiler caches compiled expressions and
+answers the expressions the index can handle without evaluating them.
+
+Indexes (and liveList caches) are only kept between lookups for documents passed to trackMutations, that is
+documents whose mutations are reported to the hooks. Other documents are walked again on every lookup.
+"""
+
+from re import compile as REcompile
+from collections import OrderedDict
+from weakref import WeakSet, ref
+from warnings import warn
+from gdom.basicTypes import DOMException
+
+
+ELEMENT_NODE            = 1
+DOCUMENT_NODE           = 9
+
+ORDERED_NODE_SNAPSHOT_TYPE = 7
+
+ATTLIST = REcompile(r"<!ATTLIST\s+(\S+)([^>]*)>")
+ATTDEF_ID = REcompile(r"(\S+)\s+ID\s")
+
+
+def walkElements(root):
+    """ Yield elements under 'root' (included) in document order, without recursion. """
+
+    node = root
+    while node is not None:
+        if node.nodeType == ELEMENT_NODE: yield node
+        if node.firstChild is not None:
+            node = node.firstChild
+            continue
+        while node is not root and node.nextSibling is None: node = node.parentNode
+        node = None if node is root else node.nextSibling
+
+_tracked = WeakSet()   # Documents whose mutations are reported, see trackMutations.
+
+def trackMutations(document, tracked=True):
+    """ Declare that the DOM implementation reports every mutation of 'document' : to its DocumentIndex (nodeInserted,
+        nodeRemoved, attributeModified) and to liveList.subtreeModified. Cached lookups are only trusted for such documents. """
+    if tracked: _tracked.add(document)
+    else: _tracked.discard(document)
+
+def isTracked(node):
+    document = node if node.nodeType == DOCUMENT_NODE else node.ownerDocument
+    return document is not None and document in _tracked
+
+NODE_SLOTS = ("_nodeCache", "__weakref__") # To include in the __slots__ of node classes : per-node caches, weak references (versions, tracking).
+
+def nodeCache(node, name, factory):
+    """ Return entry 'name' of the cache attached to 'node', created by 'factory' on first use. The cache lives and dies with the node.
+        It is stored in the _nodeCache attribute (instance __dict__ or slot, see NODE_SLOTS) ; nodes that can hold neither
+        get None (nothing is cached for them) and a warning. """
+    try: cache = node._nodeCache
+    except AttributeError:
+        try: object.__setattr__(node, "_nodeCache", {})
+        except AttributeError:
+            warn("%s can't hold a _nodeCache, add nodeIndex.NODE_SLOTS to its __slots__ : lookups on it are not cached" % type(node).__name__, RuntimeWarning, 2)
+            return None
+        cache = node._nodeCache
+    value = cache.get(name)
+    if value is None: value = cache[name] = factory()
+    return value
+
+def declaredIds(doctype):
+    """ Return the set of (elementName, attributeName) declared as ID in the internal subset of 'doctype'. """
+
+    ids = set()
+    subset = doctype.internalSubset if doctype is not None else None
+    for match in ATTLIST.finditer(subset or ""):
+        for attribute in ATTDEF_ID.findall(match.group(2) + " "): ids.add((match.group(1), attribute))
+    return ids
+
+
+class DocumentIndex:
+    """ Index of the elements of a document.
+        Keep it up to date by calling nodeInserted, nodeRemoved and attributeModified after each mutation : nodes appended
+        at the end of the document are indexed incrementally, removals cost O(size of the removed subtree) and other
+        insertions make the index rebuild on next lookup.
+        Unless the document is tracked (see trackMutations), nothing is kept : each lookup is one filtered walk of the document. """
+
+    def __init__(self, document):
+
+        self.__document = ref(document)
+        self.idAttributes = declaredIds(getattr(document, "doctype", None))
+        self.__stale = True
+
+    @property
+    def document(self): return self.__document()
+
+    def __build(self):
+        # Element sets are dicts (element -> None) : ordered like the document, since only appends are indexed incrementally.
+        self.__byName, self.__byTagName, self.__byId, self.__ids, self.__order = {}, {}, {}, {}, {}
+        for element in walkElements(self.document): self.__add(element)
+        self.__stale = False
+
+    def __add(self, element):
+        self.__order[element] = None
+        self.__byName.setdefault(self.__key(element), {})[element] = None
+        self.__byTagName.setdefault(element.nodeName, {})[element] = None
+        ids = self.__idsOf(element)
+        if ids:
+            self.__ids[element] = ids
+            for elementId in ids: self.__byId.setdefault(elementId, element) # First element in document order wins.
+
+    def __idsOf(self, element):
+        attributes = element.attributes
+        return [attr.value for attr in (attributes.item(i) for i in range(attributes.length if attributes else 0))
+                if getattr(attr, "isId", False) or (element.nodeName, attr.nodeName) in self.idAttributes]
+
+    def __key(self, element): return (element.namespaceURI or None, element.localName or element.nodeName)
+
+    def __indexed(self):
+        """ True if lookups can use the index (building it if needed), False if the document must be walked. """
+        if self.document not in _tracked: return False
+        if self.__stale: self.__build()
+        return True
+
+    # Lookups =========================================== #
+
+    def getElementsByTagNameNS(self, namespaceURI, localName):
+        """ Elements in document order, "*" matches any namespaceURI / localName. """
+
+        if namespaceURI != "*": namespaceURI = namespaceURI or None
+        if not self.__indexed():
+            elements = walkElements(self.document)
+            if localName != "*": # localName is a computed property in some implementations : filter on nodeName ("name" or "prefix:name") first.
+                suffix = ":" + localName
+                elements = (element for element in elements if element.nodeName == localName
+                            or (element.nodeName.endswith(suffix) and element.localName == localName))
+            if namespaceURI == "*": return list(elements)
+            return [element for element in elements if (element.namespaceURI or None) == namespaceURI]
+        if namespaceURI != "*" and localName != "*": return list(self.__byName.get((namespaceURI, localName), ()))
+        if namespaceURI == "*" and localName == "*": return list(self.__order)
+        order = {element: i for i, element in enumerate(self.__order)}
+        found = [elements for (uri, name), elements in self.__byName.items() if namespaceURI in ("*", uri) and localName in ("*", name)]
+        return sorted((element for elements in found for element in elements), key=order.__getitem__)
+
+    def getElementsByTagName(self, tagName):
+        if not self.__indexed(): return [element for element in walkElements(self.document) if tagName in ("*", element.nodeName)]
+        return list(self.__byTagName.get(tagName, ()) if tagName != "*" else self.__order)
+
+    def getElementById(self, elementId):
+        if not self.__indexed(): return next((element for element in walkElements(self.document) if elementId in self.__idsOf(element)), None)
+        return self.__byId.get(elementId)
+
+    # Mutations ========================================= #
+
+    def nodeInserted(self, node):
+        """ Call after 'node' (and its subtree) has been inserted into the document. """
+
+        if self.__stale: return
+        if not self.__isLast(node):
+            self.__stale = True
+            return
+        for element in walkElements(node): self.__add(element)
+
+    def nodeRemoved(self, node):
+        """ Call after 'node' (and its subtree) has been removed from the document. """
+
+        if self.__stale: return
+        for element in walkElements(node):
+            if self.__order.pop(element, False) is not None: continue # Not indexed.
+            del self.__byName[self.__key(element)][element]
+            del self.__byTagName[element.nodeName][element]
+            for elementId in self.__ids.pop(element, ()):
+                if self.__byId.get(elementId) is element: del self.__byId[elementId] # Duplicate IDs are undefined behavior in DOM.
+
+    def attributeModified(self, element, name, oldValue, newValue):
+        """ Call after attribute 'name' of 'element' changed from 'oldValue' to 'newValue' (None when added / removed). """
+
+        if self.__stale or element not in self.__order or (element.nodeName, name) not in self.idAttributes: return
+        ids = self.__ids.setdefault(element, [])
+        if oldValue is not None and oldValue in ids:
+            ids.remove(oldValue)
+            if self.__byId.get(oldValue) is element: del self.__byId[oldValue]
+        if newValue is not None:
+            ids.append(newValue)
+            self.__byId.setdefault(newValue, element)
+
+    def __isLast(self, node):
+        """ True if nothing follows 'node' in document order. """
+        while node is not None and node is not self.document:
+            if node.nextSibling is not None: return False
+            node = node.parentNode
+        return node is self.document
+
+def documentIndex(document):
+    """ Return the DocumentIndex of 'document', creating it on first use. """
+    return nodeCache(document, "_documentIndex", lambda: DocumentIndex(document)) or DocumentIndex(document)
+
+
+class CompiledXPath:
+    """ XPath expression answered from the DocumentIndex when possible, by the XPathEvaluator otherwise.
+        evaluate returns the resulting nodes as a list in document order. """
+
+    # Expressions served by the index : //name, //prefix:name, //name[@attr='value'] and id('value')
+    PATH = REcompile(r"\s*//(?:([\w.-]+):)?([\w.-]+|\*)\s*(?:\[\s*@([\w.-]+)\s*=\s*(?:'([^']*)'|\"([^\"]*)\")\s*\])?\s*$")
+    ID = REcompile(r"\s*id\(\s*(?:'([^']*)'|\"([^\"]*)\")\s*\)\s*$")
+
+    def __init__(self, expression, resolver=None, evaluator=None):
+
+        self.expression = expression
+        self.resolver = resolver
+        self.__evaluator = evaluator
+        self.__compiled = None
+        self.__fast = None
+
+        match = self.ID.match(expression)
+        if match: self.__fast = ("id", match.group(1) if match.group(1) is not None else match.group(2))
+        match = self.PATH.match(expression)
+        if match:
+            prefix, localName, attribute, value = match.group(1), match.group(2), match.group(3), match.group(4) if match.group(4) is not None else match.group(5)
+            namespaceURI = resolver.lookupNamespaceURI(prefix) if prefix and resolver is not None else None
+            if not prefix or namespaceURI: self.__fast = ("path", namespaceURI if prefix else None, localName, attribute, value)
+
+    def evaluate(self, contextNode):
+
+        document = contextNode if contextNode.nodeType == DOCUMENT_NODE else contextNode.ownerDocument
+        # Untracked documents only use the index when there's no evaluator : it then answers with one walk of the document.
+        if self.__fast is not None and document is not None and (document in _tracked or self.__evaluator is None):
+            return self.__evaluateIndex(documentIndex(document))
+        if self.__evaluator is None: raise DOMException("NOT_SUPPORTED_ERR", "No XPathEvaluator to evaluate '%s'" % self.expression)
+        if self.__compiled is None: self.__compiled = self.__evaluator.createExpression(self.expression, self.resolver)
+        result = self.__compiled.evaluate(contextNode, ORDERED_NODE_SNAPSHOT_TYPE, None)
+        return [result.snapshotItem(i) for i in range(result.snapshotLength)]
+
+    def __evaluateIndex(self, index):
+
+        if self.__fast[0] == "id":
+            element = index.getElementById(self.__fast[1])
+            return [element] if element is not None else []
+        kind, namespaceURI, localName, attribute, value = self.__fast # namespaceURI is None without prefix : XPath 1.0 unprefixed names match no namespace.
+        if attribute is not None and (localName, attribute) in index.idAttributes:
+            element = index.getElementById(value)
+            return [element] if element is not None and localName == (element.localName or element.nodeName) and (element.namespaceURI or None) == namespaceURI else []
+        elements = index.getElementsByTagNameNS(namespaceURI if localName != "*" or namespaceURI is not None else "*", localName)
+        if attribute is not None: elements = [element for element in elements if element.hasAttribute(attribute) and element.getAttribute(attribute) == value]
+        return elements
+
+
+class XPathCompiler:
+    """ LRU cache of CompiledXPath, keyed by expression string and namespace resolver. """
+
+    def __init__(self, evaluator=None, maxsize=256):
+
+        self.evaluator = evaluator # XPathEvaluator used for expressions the index can't answer (they raise NOT_SUPPORTED_ERR without it).
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self.__expressions = OrderedDict()
+
+    def compile(self, expression, resolver=None):
+
+        key = (expression, resolver)
+        try:
+            compiled = self.__expressions[key]
+            self.__expressions.move_to_end(key)
+            self.hits += 1
+        except KeyError:
+            compiled = self.__expressions[key] = CompiledXPath(expression, resolver, self.evaluator)
+            if len(self.__expressions) > self.maxsize: self.__expressions.popitem(last=False)
+            self.misses += 1
+        return compiled
+
+    def evaluate(self, expression, contextNode, resolver=None): return self.compile(expression, resolver).evaluate(contextNode)
+
+    def info(self): return {"hits": self.hits, "misses": self.misses, "maxsize": self.maxsize, "size": len(self.__expressions)}
+
+
+
+"""
+
+DOCTEST :
+    Note : variable named 'nocare' will avoid object representation which may generate useless doctest error.
+
+>>> from gdom import *
+>>> from gdom.nodeIndex import XPathCompiler, documentIndex, trackMutations
+>>> doc = DOMImplementation().createDocument()
+>>> root = doc.appendChild(doc.createElement("bookstore"))
+>>> for i in range(3): root.appendChild(doc.createElement("book")).setAttribute("id", "b%d" % i)
+>>> compiler = XPathCompiler()
+>>> len(compiler.evaluate("//book", doc)), compiler.evaluate("//book[@id='b1']", doc)[0].getAttribute("id")
+(3, 'b1')
+>>> # Mutations aren't reported for this document : lookups walk it again.
+>>> nocare = root.appendChild(doc.createElement("book"))
+>>> len(compiler.evaluate("//book", doc))
+4
+>>> # Once tracked, the index is kept and updated by the hooks.
+>>> trackMutations(doc)
+>>> book = root.appendChild(doc.createElement("book"))
+>>> documentIndex(doc).nodeInserted(book)
+>>> len(compiler.evaluate("//book", doc)), compiler.info()["hits"]
+(5, 2)
+>>> compiler.evaluate("//book/title", doc)
+Traceback (most recent call last):
+    ...
+gdom.basicTypes.DOMException: NOT_SUPPORTED_ERR : No XPathEvaluator to evaluate '//book/title'
+
+"""
+
+
+
+if __name__ == "__main__":
+    import doctest
+    print(" Test starting ".center(40, "="), "\n")
+    doctest.testfile("nodeIndex.py")
+    print("", " Test finished ".center(40, "="), sep="\n")
@@ -0,0 +1,142 @@
+""" Opt-in instrumentation of gdom hot paths.
+Profiler.enable replaces the instrumented methods by counting / timing wrappers and disable puts the original
+methods back, so a disabled profiler costs nothing. Only one Profiler can be enabled at a time. Snapshots are plain dicts (or JSON) :
+    {"operation": {"calls": int, "seconds": float, "blocks": int}, ...}
+'seconds' is cumulative (it includes nested instrumented calls), 'blocks' is the net number of memory blocks
+allocated by the calls (only tracked with trackAllocations, see sys.getallocatedblocks).
+"""
+
+import sys, json
+from time import perf_counter
+from gdom.basicTypes import DOMString, OneTypeList, DOMConfiguration, DOMException
+
+
+# (owner, attribute) instrumented by default : DOMString wrapping, OneTypeList checks, configuration and serialization.
+DEFAULT_TARGETS = [
+    (DOMString, "__new__"), (DOMString, "__add__"), (DOMString, "__getitem__"), (DOMString, "lower"), (DOMString, "strip"),
+    (DOMString, "toLowerCase"), (DOMString, "toUpperCase"), (DOMString, "matches"), (DOMString, "replaceFirst"), (DOMString, "Split"),
+    (OneTypeList, "__init__"), (OneTypeList, "insert"), (OneTypeList, "append"), (OneTypeList, "extend"),
+    (OneTypeList, "indexOf"), (OneTypeList, "__contains__"),
+    (DOMConfiguration, "setParameter"), (DOMConfiguration, "getParameter"),
+]
+
+def optionalTargets():
+    """ Targets from optional gdom modules, only when they can be imported. """
+    targets = []
+    try:
+        from gdom.streamSerializer import LSStreamSerializer
+        targets.append((LSStreamSerializer, "writeToStream"))
+    except ImportError: pass
+    try:
+        from gdom.nodeIndex import CompiledXPath
+        targets.append((CompiledXPath, "evaluate"))
+    except ImportError: pass
+    return targets
+
+
+_enabled = None # The enabled Profiler : wrappers of two profilers can't be stacked and unstacked in any order.
+
+class Profiler:
+    """ Per-operation counters, cumulative timings and allocation counts. Also exposed as the "Profiling" DOM feature. """
+
+    def __init__(self, targets=None):
+
+        self.targets = list(targets) if targets is not None else DEFAULT_TARGETS + optionalTargets()
+        self.enabled = False
+        self.__stats = {}       # operation -> [calls, seconds, blocks]
+        self.__originals = []   # (owner, attribute, original value) to restore.
+
+    def instrument(self, owner, attribute):
+        """ Add a target ; it takes effect at next enable. """
+        self.targets.append((owner, attribute))
+
+    def enable(self, trackAllocations=False):
+        global _enabled
+        if self.enabled: return
+        if _enabled is not None: raise DOMException("INVALID_STATE_ERR", "Another Profiler is enabled, disable it first")
+        for owner, attribute in self.targets:
+            own = owner.__dict__.get(attribute) # None when inherited (e.g. DOMString.__new__ is str.__new__) : removed again by disable.
+            if isinstance(own, (classmethod, property)): continue
+            original = own if own is not None else getattr(owner, attribute, None)
+            if not callable(original): continue
+            label = "%s.%s" % (owner.__name__, attribute)
+            wrapper = self.__wrap(original, self.__stats.setdefault(label, [0, 0.0, 0]), trackAllocations)
+            setattr(owner, attribute, staticmethod(wrapper) if attribute == "__new__" or isinstance(own, staticmethod) else wrapper)
+            self.__originals.append((owner, attribute, own))
+        self.enabled = True
+        _enabled = self
+
+    def disable(self):
+        global _enabled
+        if not self.enabled: return
+        for owner, attribute, original in reversed(self.__originals):
+            if original is None: delattr(owner, attribute)
+            else: setattr(owner, attribute, original)
+        self.__originals.clear()
+        self.enabled = False
+        _enabled = None
+
+    def reset(self):
+        for stats in self.__stats.values(): stats[:] = [0, 0.0, 0]
+
+    def __wrap(self, function, stats, trackAllocations):
+
+        if trackAllocations:
+            getallocatedblocks = sys.getallocatedblocks
+            def wrapper(*args, **kwdargs):
+                blocks, start = getallocatedblocks(), perf_counter()
+                try: return function(*args, **kwdargs)
+                finally:
+                    stats[1] += perf_counter() - start
+                    stats[2] += getallocatedblocks() - blocks
+                    stats[0] += 1
+        else:
+            def wrapper(*args, **kwdargs):
+                start = perf_counter()
+                try: return function(*args, **kwdargs)
+                finally:
+                    stats[1] += perf_counter() - start
+                    stats[0] += 1
+        wrapper.__name__, wrapper.__doc__, wrapper.__wrapped__ = function.__name__, function.__doc__, function
+        return wrapper
+
+    def snapshot(self):
+        """ Return {operation: {"calls", "seconds", "blocks"}} for operations called at least once. """
+        return {label: {"calls": calls, "seconds": seconds, "blocks": blocks} for label, (calls, seconds, blocks) in self.__stats.items() if calls}
+
+    def toJSON(self, **kwdargs): return json.dumps(self.snapshot(), **kwdargs)
+
+    def __enter__(self):
+        self.enable()
+        return self
+    def __exit__(self, *exc): self.disable()
+
+
+profiler = Profiler() # Feature object returned for getFeature("Profiling").
+
+
+
+"""
+
+DOCTEST :
+    Note : variable named 'nocare' will avoid object representation which may generate useless doctest error.
+
+>>> from gdom import *
+>>> from gdom.basicTypes import DOMString
+>>> profiler = DOMImplementation().getFeature("Profiling")
+>>> profiler is DOMImplementation().getFeature("profiling"), DOMImplementation().hasFeature("Profiling")
+(True, True)
+>>> with profiler: nocare = DOMString("Learning XML").toLowerCase()
+>>> stats = profiler.snapshot()["DOMString.toLowerCase"]
+>>> stats["calls"], sorted(stats), profiler.enabled
+(1, ['blocks', 'calls', 'seconds'], False)
+
+"""
+
+
+
+if __name__ == "__main__":
+    import doctest
+    print(" Test starting ".center(40, "="), "\n")
+    doctest.testfile("profiling.py")
+    print("", " Test finished ".center(40, "="), sep="\n")
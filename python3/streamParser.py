@@ -0,0 +1,212 @@
+""" Incremental (pull) LS parser.
+Reads a document chunk by chunk and yields parsing events, or DOM subtrees for the elements asked for,
+so that very large documents are processed in constant memory.
+"""
+
+from xml.parsers import expat
+from gdom import XMLNS_URI
+
+
+START_ELEMENT   = "start"
+END_ELEMENT     = "end"
+TEXT            = "text"
+CDATA_SECTION   = "cdata"
+COMMENT         = "comment"
+PROCESSING_INSTRUCTION = "pi"
+
+
+class LSStreamParser:
+    """ Pull parser built on expat.
+
+        parseEvents yields (event, data) tuples :
+            ("start", (namespaceURI, qualifiedName, [(namespaceURI, qualifiedName, value), ...]))
+            ("end", (namespaceURI, qualifiedName))
+            ("text", data), ("cdata", data), ("comment", data), ("pi", (target, data))
+        Namespace declarations are reported as attributes in the XMLNS_URI namespace, internal entities are expanded.
+        Character data is reported as one event up to the next markup, whatever 'chunkSize'.
+
+        parseSubtrees yields the elements matching (namespaceURI, localName) as DOM subtrees created by 'document',
+        everything else is dropped as soon as it is parsed. """
+
+    def __init__(self, document=None, chunkSize=64*1024):
+
+        self.document = document # Node factory (createElementNS, createTextNode, ...) used by parseSubtrees.
+        self.chunkSize = chunkSize
+
+    # Events ============================================ #
+
+    def parseEvents(self, stream):
+        """ Yield events from 'stream' (binary or text file-like object), reading 'chunkSize' at a time. """
+
+        events = []
+        parser = self.__parser(events)
+        while True:
+            chunk = stream.read(self.chunkSize)
+            parser.Parse(chunk, not chunk)
+            yield from events
+            events.clear()
+            if not chunk: break
+
+    def parseURI(self, uri):
+        """ Same as parseEvents, from a file path. """
+        with open(uri, "rb") as stream: yield from self.parseEvents(stream)
+
+    def __parser(self, events):
+
+        parser = expat.ParserCreate(namespace_separator=" ")
+        parser.namespace_prefixes = True
+        parser.buffer_text = True
+        parser.buffer_size = max(self.chunkSize, 1024)
+        declarations = []
+        cdata = [False]
+        texts = []  # Character data not reported yet : expat splits text at buffer boundaries (and at every Parse call).
+
+        def name(expatName):
+            """ expat name "uri local prefix" -> (namespaceURI, qualifiedName) """
+            parts = expatName.split(" ")
+            if len(parts) == 1: return None, parts[0]
+            if len(parts) == 2: return parts[0], parts[1]
+            return parts[0], "%s:%s" % (parts[2], parts[1])
+
+        def flushText():
+            if texts:
+                events.append((CDATA_SECTION if cdata[0] else TEXT, "".join(texts)))
+                texts.clear()
+        def startNamespace(prefix, uri): declarations.append((XMLNS_URI, "xmlns:" + prefix if prefix else "xmlns", uri or ""))
+        def start(tag, attributes):
+            flushText()
+            attrs = declarations[:]
+            declarations.clear()
+            for i in range(0, len(attributes), 2): attrs.append(name(attributes[i]) + (attributes[i+1],))
+            events.append((START_ELEMENT, name(tag) + (attrs,)))
+        def end(tag):
+            flushText()
+            events.append((END_ELEMENT, name(tag)))
+        def text(data): texts.append(data)
+        def startCdata():
+            flushText()
+            cdata[0] = True
+        def endCdata():
+            flushText()
+            cdata[0] = False
+        def comment(data):
+            flushText()
+            events.append((COMMENT, data))
+        def pi(target, data):
+            flushText()
+            events.append((PROCESSING_INSTRUCTION, (target, data)))
+
+        parser.ordered_attributes = True
+        parser.StartNamespaceDeclHandler = startNamespace
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        parser.CharacterDataHandler = text
+        parser.StartCdataSectionHandler = startCdata
+        parser.EndCdataSectionHandler = endCdata
+        parser.CommentHandler = comment
+        parser.ProcessingInstructionHandler = pi
+        return parser
+
+    # Subtrees ========================================== #
+
+    def parseSubtrees(self, stream, namespaceURI, localName, lazy=False):
+        """ Yield every element named (namespaceURI, localName) ("*" matches any) as a detached DOM subtree.
+            With 'lazy', yield LSSubtree objects instead : their DOM is only built when first accessed. """
+
+        depth = 0       # Depth inside the subtree being collected, 0 when outside.
+        events = []
+        for event in self.parseEvents(stream):
+            kind, data = event
+            if depth:
+                events.append(event)
+                if kind == START_ELEMENT: depth += 1
+                elif kind == END_ELEMENT:
+                    depth -= 1
+                    if not depth:
+                        subtree = LSSubtree(self.document, events)
+                        yield subtree if lazy else subtree.node
+                        events = []
+            elif kind == START_ELEMENT and self.__matches(data, namespaceURI, localName):
+                events.append(event)
+                depth = 1
+
+    def __matches(self, data, namespaceURI, localName):
+        uri, qualifiedName = data[0], data[1]
+        return (namespaceURI == "*" or namespaceURI == uri) and (localName == "*" or localName == qualifiedName.rpartition(":")[2])
+
+
+class LSSubtree:
+    """ Events of one parsed element, turned into a DOM subtree on first access to 'node'. """
+    __slots__ = ("document", "events", "__node")
+
+    def __init__(self, document, events):
+        self.document = document
+        self.events = events
+        self.__node = None
+
+    @property
+    def node(self):
+        if self.__node is None:
+            self.__node = buildSubtree(self.document, self.events)
+            self.events = None
+        return self.__node
+
+
+def buildSubtree(document, events):
+    """ Build the DOM subtree described by 'events' (which must start with the root START_ELEMENT) and return its root. """
+
+    root = parent = None
+    for kind, data in events:
+        if kind == START_ELEMENT:
+            uri, qualifiedName, attrs = data
+            element = document.createElementNS(uri, qualifiedName) if uri else document.createElement(qualifiedName)
+            for attrURI, attrName, value in attrs:
+                if attrURI: element.setAttributeNS(attrURI, attrName, value)
+                else: element.setAttribute(attrName, value)
+            if parent is None: root = element
+            else: parent.appendChild(element)
+            parent = element
+        elif kind == END_ELEMENT: parent = parent.parentNode
+        elif kind == TEXT: parent.appendChild(document.createTextNode(data))
+        elif kind == CDATA_SECTION: parent.appendChild(document.createCDATASection(data))
+        elif kind == COMMENT: parent.appendChild(document.createComment(data))
+        elif kind == PROCESSING_INSTRUCTION: parent.appendChild(document.createProcessingInstruction(*data))
+    return root
+
+
+
+"""
+
+DOCTEST :
+
+>>> from io import BytesIO
+>>> from gdom import *
+>>> from gdom.streamParser import LSStreamParser
+>>> xml = b'<!DOCTYPE r [<!ENTITY e "entity">]><r xmlns:p="urn:p"><p:a x="1">one &e; two</p:a><![CDATA[<c>]]><![CDATA[d]]><?pi data?><!--c--></r>'
+>>> for event in LSStreamParser().parseEvents(BytesIO(xml)): print(event)
+('start', (None, 'r', [('http://www.w3.org/2000/xmlns/', 'xmlns:p', 'urn:p')]))
+('start', ('urn:p', 'p:a', [(None, 'x', '1')]))
+('text', 'one entity two')
+('end', ('urn:p', 'p:a'))
+('cdata', '<c>')
+('cdata', 'd')
+('pi', ('pi', 'data'))
+('comment', 'c')
+('end', (None, 'r'))
+>>> # Text split across chunks is still one event.
+>>> list(LSStreamParser(chunkSize=1).parseEvents(BytesIO(xml))) == list(LSStreamParser().parseEvents(BytesIO(xml)))
+True
+>>> doc = DOMImplementation().createDocument()
+>>> prices = LSStreamParser(doc, chunkSize=20).parseSubtrees(BytesIO(b'<r><price>29.99 dollars</price><price>26.45 euros</price></r>'), "*", "price")
+>>> [price.firstChild.data for price in prices]
+['29.99 dollars', '26.45 euros']
+
+"""
+
+
+
+if __name__ == "__main__":
+    import doctest
+    print(" Test starting ".center(40, "="), "\n")
+    doctest.testfile("streamParser.py")
+    print("", " Test finished ".center(40, "="), sep="\n")
@@ -0,0 +1,262 @@
+""" Streaming LS serializer.
+Serializes a DOM tree to any binary file-like object without building the whole document in memory :
+the tree is walked iteratively (no recursion, whatever the depth) and output is encoded incrementally
+into a bytearray buffer flushed every 'bufferSize' bytes.
+"""
+
+from codecs import getincrementalencoder
+from gdom import XMLNS_URI
+from gdom.basicTypes import DOMConfiguration
+
+
+XML_URI = "http://www.w3.org/XML/1998/namespace"
+
+ELEMENT_NODE                = 1
+TEXT_NODE                   = 3
+CDATA_SECTION_NODE          = 4
+ENTITY_REFERENCE_NODE       = 5
+PROCESSING_INSTRUCTION_NODE = 7
+COMMENT_NODE                = 8
+DOCUMENT_NODE               = 9
+DOCUMENT_TYPE_NODE          = 10
+DOCUMENT_FRAGMENT_NODE      = 11
+
+
+def escapeText(data): return data.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+def escapeAttribute(data): return data.replace("&", "&amp;").replace("<", "&lt;").replace('"', "&quot;").replace("\t", "&#9;").replace("\n", "&#10;").replace("\r", "&#13;")
+
+
+class LSStreamSerializer:
+    """ LSSerializer writing to a binary stream with bounded memory.
+        Namespace prefixes are fixed up at serialization (see DOM Level 3 Core, Namespace Normalization) when "namespaces" is set. """
+
+    def __init__(self, encoding="UTF-8", bufferSize=64*1024, xmlDeclaration=False):
+
+        self.domConfig = DOMConfiguration()
+        self.encoding = encoding
+        self.bufferSize = bufferSize
+        self.xmlDeclaration = xmlDeclaration
+        self.__buffer = bytearray()
+
+    def writeToStream(self, nodeArg, stream):
+        """ Serialize 'nodeArg' and write it to 'stream' (binary file-like object with a write method). """
+
+        self.__stream = stream
+        self.__encode = getincrementalencoder(self.encoding)(errors="xmlcharrefreplace").encode
+        self.__namespaces = self.domConfig.getParameter("namespaces")
+        self.__comments = self.domConfig.getParameter("comments")
+        self.__cdata = self.domConfig.getParameter("cdata-sections")
+        self.__splitCdata = self.domConfig.getParameter("split-cdata-sections")
+        self.__entities = self.domConfig.getParameter("entities")
+        self.__generated = 0
+        try:
+            self.__walk(nodeArg)
+            self.__write(self.__encode("", final=True))
+            self.__flush()
+        finally:
+            self.__buffer.clear()
+            self.__stream = None
+        return True
+
+    # Output ============================================ #
+
+    def __write(self, data):
+        self.__buffer += data
+        if len(self.__buffer) >= self.bufferSize: self.__flush()
+
+    def __flush(self):
+        if self.__buffer:
+            self.__stream.write(self.__buffer)
+            self.__buffer.clear() # The same bytearray is reused for the whole document.
+
+    def __emit(self, string): self.__write(self.__encode(string))
+
+    # Traversal ========================================= #
+
+    def __walk(self, root):
+        """ Depth-first walk through firstChild / nextSibling / parentNode, stack only holds open elements. """
+
+        stack = []  # (end tag, namespace scope) of every node being serialized.
+        node = root
+        while node is not None:
+            if self.__start(node, stack):
+                node = node.firstChild
+                continue
+            while node is not root and node.nextSibling is None:
+                node = node.parentNode
+                self.__emit(stack.pop()[0])
+            node = None if node is root else node.nextSibling
+
+    def __start(self, node, stack):
+        """ Serialize the start of 'node'. Return True (after pushing its end on 'stack') if its children must be serialized. """
+
+        nodeType = node.nodeType
+        scope = stack[-1][1] if stack else {"xml": XML_URI}
+
+        if nodeType == ELEMENT_NODE: return self.__element(node, stack, scope)
+        elif nodeType == TEXT_NODE: self.__emit(escapeText(node.data))
+        elif nodeType == CDATA_SECTION_NODE:
+            if not self.__cdata: self.__emit(escapeText(node.data))
+            elif self.__splitCdata: self.__emit("<![CDATA[%s]]>" % node.data.replace("]]>", "]]]]><![CDATA[>"))
+            else: self.__emit("<![CDATA[%s]]>" % node.data)
+        elif nodeType == COMMENT_NODE:
+            if self.__comments: self.__emit("<!--%s-->" % node.data)
+        elif nodeType == PROCESSING_INSTRUCTION_NODE: self.__emit("<?%s %s?>" % (node.target, node.data) if node.data else "<?%s?>" % node.target)
+        elif nodeType == ENTITY_REFERENCE_NODE:
+            if self.__entities or not node.hasChildNodes(): self.__emit("&%s;" % node.nodeName)
+            else: return self.__push(stack, "", scope)
+        elif nodeType == DOCUMENT_TYPE_NODE: self.__emit(self.__doctype(node))
+        elif nodeType == DOCUMENT_NODE:
+            if self.xmlDeclaration: self.__emit('<?xml version="%s" encoding="%s"?>' % (getattr(node, "xmlVersion", None) or "1.0", self.encoding))
+            return node.hasChildNodes() and self.__push(stack, "", scope)
+        elif nodeType == DOCUMENT_FRAGMENT_NODE: return node.hasChildNodes() and self.__push(stack, "", scope)
+        return False
+
+    def __push(self, stack, end, scope):
+        stack.append((end, scope))
+        return True
+
+    def __doctype(self, node):
+        string = "<!DOCTYPE " + node.name
+        if node.publicId: string += ' PUBLIC "%s" "%s"' % (node.publicId, node.systemId or "")
+        elif node.systemId: string += ' SYSTEM "%s"' % node.systemId
+        if node.internalSubset: string += " [%s]" % node.internalSubset
+        return string + ">"
+
+    # Elements and namespace fixup ====================== #
+
+    def __element(self, node, stack, scope):
+
+        attributes = [node.attributes.item(i) for i in range(node.attributes.length)] if node.attributes else []
+        if self.__namespaces:
+            tagName, attrs, scope = self.__fixup(node, attributes, scope)
+        else:
+            tagName, attrs = node.nodeName, [(attr.nodeName, attr.value) for attr in attributes]
+
+        string = "<" + tagName
+        for name, value in attrs: string += ' %s="%s"' % (name, escapeAttribute(value))
+        if not node.hasChildNodes():
+            self.__emit(string + "/>")
+            return False
+        self.__emit(string + ">")
+        return self.__push(stack, "</%s>" % tagName, scope)
+
+    def __fixup(self, node, attributes, scope):
+        """ Return (qualified tag name, [(attribute name, value)], scope of children) with every namespace declared. """
+
+        local = {}  # Declarations made by this element : prefix ("" for default namespace) -> namespaceURI
+        attrs = []
+        for attr in attributes:
+            if attr.namespaceURI == XMLNS_URI:
+                local["" if attr.nodeName == "xmlns" else attr.localName] = attr.value
+                attrs.append((attr.nodeName, attr.value))
+        if local: scope = dict(scope, **local) # Copy-on-write : elements without declarations share their parent scope.
+
+        # Element
+        namespaceURI, prefix = node.namespaceURI, node.prefix
+        localName = node.localName or node.nodeName
+        if namespaceURI:
+            if scope.get(prefix or "") != namespaceURI:
+                found = self.__lookupPrefix(scope, namespaceURI, prefix is None)
+                if found is None: scope = self.__declare(scope, attrs, prefix or "", namespaceURI, local)
+                else: prefix = found or None
+        elif scope.get(""):
+            scope = self.__declare(scope, attrs, "", "", local)
+        tagName = "%s:%s" % (prefix, localName) if prefix else localName
+
+        # Attributes
+        for attr in attributes:
+            namespaceURI = attr.namespaceURI
+            if namespaceURI == XMLNS_URI: continue
+            if not namespaceURI:
+                attrs.append((attr.nodeName, attr.value))
+                continue
+            prefix = attr.prefix
+            if not prefix or scope.get(prefix) != namespaceURI:
+                prefix = self.__lookupPrefix(scope, namespaceURI, False)
+                if prefix is None:
+                    prefix = attr.prefix if attr.prefix and attr.prefix not in scope else self.__generatePrefix(scope)
+                    scope = self.__declare(scope, attrs, prefix, namespaceURI)
+            attrs.append(("%s:%s" % (prefix, attr.localName), attr.value))
+
+        return tagName, attrs, scope
+
+    def __lookupPrefix(self, scope, namespaceURI, allowDefault):
+        """ Return a prefix ("" for default namespace) bound to namespaceURI in scope, or None. """
+        for prefix, uri in scope.items():
+            if uri == namespaceURI and (prefix or allowDefault): return prefix
+        return None
+
+    def __declare(self, scope, attrs, prefix, namespaceURI, local=()):
+        name = "xmlns:" + prefix if prefix else "xmlns"
+        if prefix in local: attrs[[attr[0] for attr in attrs].index(name)] = (name, namespaceURI) # Element's own declaration clashes : changed, as DOM Level 3 normalization does.
+        else: attrs.append((name, namespaceURI))
+        return dict(scope, **{prefix: namespaceURI})
+
+    def __generatePrefix(self, scope):
+        while True:
+            self.__generated += 1
+            prefix = "NS%d" % self.__generated
+            if prefix not in scope: return prefix
+
+
+
+"""
+
+DOCTEST :
+    Note : variable named 'nocare' will avoid object representation which may generate useless doctest error.
+
+>>> from io import BytesIO
+>>> from gdom import *
+>>> from gdom.streamSerializer import LSStreamSerializer
+>>> def serialize(node, serializer=None):
+...     stream = BytesIO()
+...     nocare = (serializer or LSStreamSerializer()).writeToStream(node, stream)
+...     return stream.getvalue().decode()
+>>> doc = DOMImplementation().createDocument()
+>>> root = doc.createElement("root")
+>>> item = doc.createElement("item")
+>>> itemNS = doc.createElementNS("http://namespaceURI.be/", "tag")
+>>> # No prefix --> should be fixed at serialization
+>>> root.setAttributeNS(XMLNS_URI, "xmlns:prefix", "http://namespaceURI.be/")
+>>> nocare = item.appendChild(doc.createTextNode("text content"))
+>>> nocare = itemNS.appendChild(doc.createCDATASection("<p> CDATASection </p>"))
+>>> nocare = root.appendChild(item)
+>>> nocare = root.appendChild(itemNS)
+>>> nocare = doc.appendChild(root)
+>>> serialize(doc)
+'<root xmlns:prefix="http://namespaceURI.be/"><item>text content</item><prefix:tag><![CDATA[<p> CDATASection </p>]]></prefix:tag></root>'
+>>> # Out of the declaring element's scope, the namespace is declared where it is used.
+>>> serialize(itemNS)
+'<tag xmlns="http://namespaceURI.be/"><![CDATA[<p> CDATASection </p>]]></tag>'
+>>> # Undeclared attribute namespaces get generated prefixes.
+>>> item.setAttributeNS("http://other.be/", "lang", "en")
+>>> serialize(item)
+'<item xmlns:NS1="http://other.be/" NS1:lang="en">text content</item>'
+>>> # A declaration of the element clashing with its own namespace is changed, attributes it applied to get another prefix.
+>>> clash = doc.createElementNS("urn:a", "p:x")
+>>> clash.setAttributeNS(XMLNS_URI, "xmlns:p", "urn:b")
+>>> clash.setAttributeNS("urn:b", "p:y", "1")
+>>> serialize(clash)
+'<p:x xmlns:p="urn:a" xmlns:NS1="urn:b" NS1:y="1"/>'
+>>> noNamespace = doc.createElement("x")
+>>> noNamespace.setAttributeNS(XMLNS_URI, "xmlns", "urn:a")
+>>> serialize(noNamespace)
+'<x xmlns=""/>'
+>>> # Escaping and empty elements.
+>>> empty = doc.createElement("empty")
+>>> empty.setAttribute("title", 'a "quoted" <value>')
+>>> nocare = item.appendChild(empty)
+>>> nocare = item.appendChild(doc.createTextNode(" & more <text>"))
+>>> serialize(item)
+'<item xmlns:NS1="http://other.be/" NS1:lang="en">text content<empty title="a &quot;quoted&quot; &lt;value>"/> &amp; more &lt;text&gt;</item>'
+
+"""
+
+
+
+if __name__ == "__main__":
+    import doctest
+    print(" Test starting ".center(40, "="), "\n")
+    doctest.testfile("streamSerializer.py")
+    print("", " Test finished ".center(40, "="), sep="\n")
@@ -0,0 +1,345 @@
+""" DOM Level 2 Traversal : NodeFilter, NodeIterator and TreeWalker (see http://www.w3.org/TR/DOM-Level-2-Traversal-Range/traversal.html).
+Every traversal is iterative (firstChild / nextSibling / parentNode moves and explicit stacks), so tree depth
+is never limited by Python's recursion limit.
+"""
+
+from collections import deque
+from gdom.basicTypes import DOMException
+
+
+class NodeFilter:
+    """ Base class for node filters. A plain callable taking a node is accepted wherever a NodeFilter is.
+        Filters may also define acceptNodes(nodes) returning one result per node : NodeIterator calls it
+        with batches of nodes when prefetching. """
+
+    FILTER_ACCEPT   = 1
+    FILTER_REJECT   = 2
+    FILTER_SKIP     = 3
+
+    SHOW_ALL                    = 0xFFFFFFFF
+    SHOW_ELEMENT                = 0x00000001
+    SHOW_ATTRIBUTE              = 0x00000002
+    SHOW_TEXT                   = 0x00000004
+    SHOW_CDATA_SECTION          = 0x00000008
+    SHOW_ENTITY_REFERENCE       = 0x00000010
+    SHOW_ENTITY                 = 0x00000020
+    SHOW_PROCESSING_INSTRUCTION = 0x00000040
+    SHOW_COMMENT                = 0x00000080
+    SHOW_DOCUMENT               = 0x00000100
+    SHOW_DOCUMENT_TYPE          = 0x00000200
+    SHOW_DOCUMENT_FRAGMENT      = 0x00000400
+    SHOW_NOTATION               = 0x00000800
+
+    def acceptNode(self, n): return NodeFilter.FILTER_ACCEPT
+
+FILTER_ACCEPT, FILTER_REJECT, FILTER_SKIP = NodeFilter.FILTER_ACCEPT, NodeFilter.FILTER_REJECT, NodeFilter.FILTER_SKIP
+
+
+def shownTypes(whatToShow):
+    """ Precompute whatToShow as a tuple indexed by nodeType (1 to 12). """
+    return (False,) + tuple(bool(whatToShow & (1 << (nodeType - 1))) for nodeType in range(1, 13))
+
+def acceptFunction(whatToShow, nodeFilter):
+    """ Return node -> FILTER_ACCEPT / FILTER_REJECT / FILTER_SKIP combining whatToShow and nodeFilter. """
+
+    shown = shownTypes(whatToShow)
+    accept = getattr(nodeFilter, "acceptNode", nodeFilter)
+    if accept is None: return lambda node: FILTER_ACCEPT if shown[node.nodeType] else FILTER_SKIP
+    return lambda node: accept(node) if shown[node.nodeType] else FILTER_SKIP
+
+
+def walk(root, whatToShow=NodeFilter.SHOW_ALL, nodeFilter=None):
+    """ Generator yielding accepted nodes under 'root' (included) in document order, FILTER_REJECT prunes subtrees.
+        This is the fast path for full walks : it doesn't keep a current node nor handle mutations during the walk. """
+
+    accept = acceptFunction(whatToShow, nodeFilter)
+    stack = [root]  # Next node to visit at each depth.
+    while stack:
+        node = stack.pop()
+        result = accept(node)
+        if result == FILTER_ACCEPT: yield node
+        if node is not root and node.nextSibling is not None: stack.append(node.nextSibling)
+        if result != FILTER_REJECT and node.firstChild is not None: stack.append(node.firstChild)
+
+
+def following(node, root):
+    """ Node after 'node' in document order within 'root', or None. """
+    if node.firstChild is not None: return node.firstChild
+    while node is not root:
+        if node.nextSibling is not None: return node.nextSibling
+        node = node.parentNode
+    return None
+
+def preceding(node, root):
+    """ Node before 'node' in document order within 'root', or None. """
+    if node is root: return None
+    sibling = node.previousSibling
+    if sibling is None: return node.parentNode
+    while sibling.lastChild is not None: sibling = sibling.lastChild
+    return sibling
+
+
+class NodeIterator:
+    """ Flat view of the subtree of 'root' in document order (FILTER_REJECT acts as FILTER_SKIP).
+        With 'prefetch' > 1, nextNode scans that many nodes ahead and filters them as one batch ; nodes prefetched
+        are not re-examined, so don't mix prefetching with mutations of the subtree during iteration. """
+
+    def __init__(self, root, whatToShow=NodeFilter.SHOW_ALL, nodeFilter=None, expandEntityReferences=False, prefetch=1):
+
+        self.root = root
+        self.whatToShow = whatToShow
+        self.filter = nodeFilter
+        self.expandEntityReferences = expandEntityReferences
+        self.referenceNode = root
+        self.pointerBeforeReferenceNode = True
+        self.prefetch = prefetch
+        self.__accept = acceptFunction(whatToShow, nodeFilter)
+        self.__shown = shownTypes(whatToShow)
+        self.__ahead = deque()  # Accepted nodes found after referenceNode.
+        self.__scanned = None   # Last node examined by prefetching.
+        self.__detached = False
+
+    def nextNode(self):
+        self.__checkDetached()
+        if self.prefetch > 1: return self.__nextPrefetched()
+        node, before = self.referenceNode, self.pointerBeforeReferenceNode
+        while True:
+            if before: before = False
+            else:
+                node = following(node, self.root)
+                if node is None: return None
+            if self.__accept(node) == FILTER_ACCEPT: break
+        self.referenceNode, self.pointerBeforeReferenceNode = node, False
+        return node
+
+    def previousNode(self):
+        self.__checkDetached()
+        self.__ahead.clear()
+        self.__scanned = None
+        node, before = self.referenceNode, self.pointerBeforeReferenceNode
+        while True:
+            if not before: before = True
+            else:
+                node = preceding(node, self.root)
+                if node is None: return None
+            if self.__accept(node) == FILTER_ACCEPT: break
+        self.referenceNode, self.pointerBeforeReferenceNode = node, True
+        return node
+
+    def __nextPrefetched(self):
+        while not self.__ahead:
+            node = self.__scanned
+            if node is None: node = self.referenceNode if self.pointerBeforeReferenceNode else following(self.referenceNode, self.root)
+            else: node = following(node, self.root)
+            candidates = []
+            while node is not None and len(candidates) < self.prefetch:
+                candidates.append(node)
+                node = following(node, self.root) if len(candidates) < self.prefetch else None
+            if not candidates: return None
+            self.__scanned = candidates[-1]
+            self.__ahead.extend(self.__filterBatch(candidates))
+        node = self.__ahead.popleft()
+        self.referenceNode, self.pointerBeforeReferenceNode = node, False
+        return node
+
+    def __filterBatch(self, nodes):
+        """ Return the accepted nodes of 'nodes', calling the filter once for the whole batch when it supports it. """
+        shown = [node for node in nodes if self.__shown[node.nodeType]]
+        acceptNodes = getattr(self.filter, "acceptNodes", None)
+        if acceptNodes is not None: results = acceptNodes(shown)
+        else:
+            accept = getattr(self.filter, "acceptNode", self.filter)
+            if accept is None: return shown
+            results = map(accept, shown)
+        return [node for node, result in zip(shown, results) if result == FILTER_ACCEPT]
+
+    def detach(self): self.__detached = True
+
+    def __checkDetached(self):
+        if self.__detached: raise DOMException("INVALID_STATE_ERR", "NodeIterator is detached")
+
+    def __iter__(self):
+        node = self.nextNode()
+        while node is not None:
+            yield node
+            node = self.nextNode()
+
+
+class TreeWalker:
+    """ Filtered view of the subtree of 'root', moving 'currentNode' around (FILTER_REJECT skips whole subtrees). """
+
+    def __init__(self, root, whatToShow=NodeFilter.SHOW_ALL, nodeFilter=None, expandEntityReferences=False):
+
+        self.root = root
+        self.whatToShow = whatToShow
+        self.filter = nodeFilter
+        self.expandEntityReferences = expandEntityReferences
+        self.currentNode = root
+        self.__accept = acceptFunction(whatToShow, nodeFilter)
+
+    def parentNode(self):
+        node = self.currentNode
+        while node is not None and node is not self.root:
+            node = node.parentNode
+            if node is not None and self.__accept(node) == FILTER_ACCEPT:
+                self.currentNode = node
+                return node
+        return None
+
+    def firstChild(self): return self.__traverseChildren(True)
+    def lastChild(self): return self.__traverseChildren(False)
+    def nextSibling(self): return self.__traverseSiblings(True)
+    def previousSibling(self): return self.__traverseSiblings(False)
+
+    def __traverseChildren(self, first):
+        node = self.currentNode.firstChild if first else self.currentNode.lastChild
+        while node is not None:
+            result = self.__accept(node)
+            if result == FILTER_ACCEPT:
+                self.currentNode = node
+                return node
+            if result == FILTER_SKIP:
+                child = node.firstChild if first else node.lastChild
+                if child is not None:
+                    node = child
+                    continue
+            while node is not None:
+                sibling = node.nextSibling if first else node.previousSibling
+                if sibling is not None:
+                    node = sibling
+                    break
+                parent = node.parentNode
+                if parent is None or parent is self.root or parent is self.currentNode: return None
+                node = parent
+        return None
+
+    def __traverseSiblings(self, forward):
+        node = self.currentNode
+        if node is self.root: return None
+        while True:
+            sibling = node.nextSibling if forward else node.previousSibling
+            while sibling is not None:
+                node = sibling
+                result = self.__accept(node)
+                if result == FILTER_ACCEPT:
+                    self.currentNode = node
+                    return node
+                sibling = node.firstChild if forward else node.lastChild
+                if result == FILTER_REJECT or sibling is None: sibling = node.nextSibling if forward else node.previousSibling
+            node = node.parentNode
+            if node is None or node is self.root: return None
+            if self.__accept(node) == FILTER_ACCEPT: return None
+
+    def previousNode(self):
+        node = self.currentNode
+        while node is not self.root:
+            sibling = node.previousSibling
+            while sibling is not None:
+                node = sibling
+                result = self.__accept(node)
+                while result != FILTER_REJECT and node.lastChild is not None:
+                    node = node.lastChild
+                    result = self.__accept(node)
+                if result == FILTER_ACCEPT:
+                    self.currentNode = node
+                    return node
+                sibling = node.previousSibling
+            if node is self.root or node.parentNode is None: return None
+            node = node.parentNode
+            if self.__accept(node) == FILTER_ACCEPT:
+                self.currentNode = node
+                return node
+        return None
+
+    def nextNode(self):
+        node, result = self.currentNode, FILTER_ACCEPT
+        while True:
+            while result != FILTER_REJECT and node.firstChild is not None:
+                node = node.firstChild
+                result = self.__accept(node)
+                if result == FILTER_ACCEPT:
+                    self.currentNode = node
+                    return node
+            while True:
+                if node is self.root: return None
+                if node.nextSibling is not None:
+                    node = node.nextSibling
+                    break
+                node = node.parentNode
+                if node is None: return None
+            result = self.__accept(node)
+            if result == FILTER_ACCEPT:
+                self.currentNode = node
+                return node
+
+    def __iter__(self):
+        """ Generator over the nodes following currentNode (moving it). """
+        node = self.nextNode()
+        while node is not None:
+            yield node
+            node = self.nextNode()
+
+
+def createNodeIterator(root, whatToShow=NodeFilter.SHOW_ALL, nodeFilter=None, entityReferenceExpansion=False, prefetch=1):
+    """ DocumentTraversal.createNodeIterator """
+    if root is None: raise DOMException("NOT_SUPPORTED_ERR", "root can't be null")
+    return NodeIterator(root, whatToShow, nodeFilter, entityReferenceExpansion, prefetch)
+
+def createTreeWalker(root, whatToShow=NodeFilter.SHOW_ALL, nodeFilter=None, entityReferenceExpansion=False):
+    """ DocumentTraversal.createTreeWalker """
+    if root is None: raise DOMException("NOT_SUPPORTED_ERR", "root can't be null")
+    return TreeWalker(root, whatToShow, nodeFilter, entityReferenceExpansion)
+
+
+
+"""
+
+DOCTEST :
+    Note : variable named 'nocare' will avoid object representation which may generate useless doctest error.
+
+>>> from gdom import *
+>>> from gdom.traversal import NodeFilter, createNodeIterator, createTreeWalker, walk
+>>> doc = DOMImplementation().createDocument()
+>>> root = doc.appendChild(doc.createElement("root"))
+>>> for name in ("a", "b", "c"): nocare = root.appendChild(doc.createElement(name))
+>>> nocare = root.firstChild.appendChild(doc.createElement("a1"))
+>>> nocare = root.firstChild.appendChild(doc.createTextNode("text"))
+>>> [node.nodeName for node in walk(root, NodeFilter.SHOW_ELEMENT)]
+['root', 'a', 'a1', 'b', 'c']
+>>> rejectA = lambda node: NodeFilter.FILTER_REJECT if node.nodeName == "a" else NodeFilter.FILTER_ACCEPT
+>>> [node.nodeName for node in walk(root, NodeFilter.SHOW_ELEMENT, rejectA)]
+['root', 'b', 'c']
+>>> # NodeIterator : FILTER_REJECT acts as FILTER_SKIP.
+>>> iterator = createNodeIterator(root, NodeFilter.SHOW_ELEMENT, rejectA)
+>>> [node.nodeName for node in iterator]
+['root', 'a1', 'b', 'c']
+>>> iterator.previousNode().nodeName, iterator.previousNode().nodeName
+('c', 'b')
+>>> [node.nodeName for node in createNodeIterator(root, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT, prefetch=2)]
+['root', 'a', 'a1', '#text', 'b', 'c']
+>>> walker = createTreeWalker(root, NodeFilter.SHOW_ELEMENT)
+>>> walker.firstChild().nodeName, walker.firstChild().nodeName, walker.parentNode().nodeName, walker.nextSibling().nodeName
+('a', 'a1', 'a', 'b')
+>>> walker.previousNode().nodeName, walker.lastChild(), walker.currentNode.nodeName
+('a1', None, 'a1')
+>>> [node.nodeName for node in createTreeWalker(root, NodeFilter.SHOW_ELEMENT, rejectA)]
+['b', 'c']
+>>> iterator.detach()
+>>> iterator.nextNode()
+Traceback (most recent call last):
+    ...
+gdom.basicTypes.DOMException: INVALID_STATE_ERR : NodeIterator is detached
+>>> createTreeWalker(None)
+Traceback (most recent call last):
+    ...
+gdom.basicTypes.DOMException: NOT_SUPPORTED_ERR : root can't be null
+
+"""
+
+
+
+if __name__ == "__main__":
+    import doctest
+    print(" Test starting ".center(40, "="), "\n")
+    doctest.testfile("traversal.py")
+    print("", " Test finished ".center(40, "="), sep="\n")